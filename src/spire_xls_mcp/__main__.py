@@ -1,4 +1,8 @@
-import asyncio
+try:
+    # Optional faster event loop (uvloop>=0.18)
+    from uvloop import run as run_event_loop
+except ImportError:
+    from asyncio import run as run_event_loop
 
 from .server import run_server
 
@@ -9,7 +13,7 @@ def main():
         print("Spire.Xls MCP Server")
         print("---------------")
         print("Starting server... Press Ctrl+C to exit")
-        asyncio.run(run_server())
+        run_event_loop(run_server())
     except KeyboardInterrupt:
         print("\nShutting down server...")
     except Exception as e:
@@ -1,10 +1,11 @@
 import logging
-from typing import Any
+from typing import Any, Dict
 
 from spire.xls import *
 
 from .exceptions import ValidationError, CalculationError
-from .validation import validate_formula
+from .validation import cached_formula_result
+from .workbook import get_workbook, get_sheet, mark_dirty, flush_workbook, workbook_edit
 
 logger = logging.getLogger(__name__)
 
@@ -13,43 +14,117 @@ def apply_formula(
         filepath: str,
         sheet_name: str,
         cell: str,
-        formula: str
+        formula: str,
+        flush: bool = True,
+        evaluate: bool = True
 ) -> dict[str, Any]:
-    """Apply Excel formula to cell."""
+    """Apply Excel formula to cell.
+
+    The workbook is taken from the shared workbook cache; the file must exist.
+    If the edit fails, the cache is cleaned up as described in workbook_edit().
+    With flush=False the change is only recorded in memory and calculation is
+    deferred, so a batch of formulas is calculated and written to disk once by
+    flush_workbook().
+    With evaluate=False the formula is stored without being calculated and
+    no result is returned.
+    """
     try:
+        # Fail fast, without loading the workbook, on a formula already known to be invalid
+        known = cached_formula_result(formula)
+        if known is not None and not known[0]:
+            raise CalculationError(f"Failed to apply formula: {known[1]}")
+
+        with workbook_edit(filepath, ValidationError):
+            wb = get_workbook(filepath)
+
+            sheet = get_sheet(wb, sheet_name)
+            if sheet is None:
+                raise ValidationError(f"Sheet '{sheet_name}' not found")
+
+            # Apply formula
+            try:
+                cell_range = sheet.Range[cell]
+                cell_range.Formula = formula
+                result = None
+                if flush:
+                    if evaluate:
+                        # The bindings have no single-cell Calculate(); the range
+                        # version calculates the cell through the workbook's calc chain
+                        cell_range.CalculateAllValue()
+                        result = cell_range.FormulaValue
+                    mark_dirty(filepath)
+                    flush_workbook(filepath)
+                else:
+                    mark_dirty(filepath, recalculate=evaluate)
+
+                return {
+                    "message": "Formula applied successfully",
+                    "cell": cell,
+                    "formula": formula,
+                    "result": result
+                }
+            except Exception as e:
+                raise CalculationError(f"Failed to apply formula: {str(e)}")
 
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-        
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-                
-        if sheet is None:
-            raise ValidationError(f"Sheet '{sheet_name}' not found")
-            
-        # Apply formula
-        try:
-            cell_range = sheet.Range[cell]
-            cell_range.Formula = formula
-            cell_range.CalculateAllValue()
-            result = cell_range.FormulaValue
-            wb.SaveToFile(filepath)
-            
-            return {
-                "message": "Formula applied successfully",
-                "cell": cell,
-                "formula": formula,
-                "result": result
-            }
-        except Exception as e:
-            raise CalculationError(f"Failed to apply formula: {str(e)}")
-            
     except ValidationError as e:
         logger.error(str(e))
         raise
     except Exception as e:
         logger.error(f"Failed to apply formula: {e}")
         raise CalculationError(str(e))
+
+
+def apply_formulas(
+        filepath: str,
+        sheet_name: str,
+        formulas: Dict[str, str]
+) -> dict[str, Any]:
+    """Apply several formulas to a sheet, calculating and saving the workbook once.
+
+    Args:
+        filepath: Path to Excel file
+        sheet_name: Name of worksheet
+        formulas: Mapping of cell reference to formula, e.g. {"C1": "=A1+B1"}
+
+    Returns:
+        Dictionary with operation status and the calculated value of each cell
+    """
+    try:
+        for formula in formulas.values():
+            known = cached_formula_result(formula)
+            if known is not None and not known[0]:
+                raise CalculationError(f"Failed to apply formulas: {known[1]}")
+
+        with workbook_edit(filepath, ValidationError):
+            wb = get_workbook(filepath)
+
+            sheet = get_sheet(wb, sheet_name)
+            if sheet is None:
+                raise ValidationError(f"Sheet '{sheet_name}' not found")
+
+            try:
+                cells = {}
+                for cell, formula in formulas.items():
+                    cell_range = sheet.Range[cell]
+                    cell_range.Formula = formula
+                    cells[cell] = cell_range
+
+                # Calculate before reading the values back; while a batch is
+                # open the flush below is deferred and calculates nothing
+                wb.CalculateAllValue()
+                mark_dirty(filepath)
+                flush_workbook(filepath)
+
+                return {
+                    "message": f"{len(cells)} formulas applied successfully",
+                    "results": {cell: cell_range.FormulaValue for cell, cell_range in cells.items()}
+                }
+            except Exception as e:
+                raise CalculationError(f"Failed to apply formulas: {str(e)}")
+
+    except ValidationError as e:
+        logger.error(str(e))
+        raise
+    except Exception as e:
+        logger.error(f"Failed to apply formulas: {e}")
+        raise CalculationError(str(e))
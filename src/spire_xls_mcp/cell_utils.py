@@ -1,10 +1,20 @@
-import re
+import functools
+import threading
 from typing import Tuple, Optional, Any
 import datetime
 
 from spire.xls import *
 
 
+# Byte value -> column digit (1-26) for A-Z/a-z, 0 for anything else
+_LETTER_VAL = bytearray(256)
+for _i in range(26):
+    _LETTER_VAL[ord('A') + _i] = _i + 1
+    _LETTER_VAL[ord('a') + _i] = _i + 1
+_LETTER_VAL = bytes(_LETTER_VAL)
+
+
+@functools.lru_cache(maxsize=4096)
 def letter_to_column(column_letter: str) -> int:
     """
     Convert Excel column letter to column number.
@@ -23,13 +33,17 @@ def letter_to_column(column_letter: str) -> int:
         except ValueError:
             raise ValueError(f"Invalid column letter: {column_letter}")
 
-    column_letter = column_letter.upper()
     result = 0
-    for char in column_letter:
-        result = result * 26 + (ord(char) - ord('A') + 1)
+    for b in column_letter.encode('ascii', 'replace'):
+        value = _LETTER_VAL[b]
+        if not value:
+            raise ValueError(f"Invalid column letter: {column_letter}")
+        result = result * 26 + value
     return result
 
 
+# typed: 1.0 must not hit the entry cached for 1 and skip the int check
+@functools.lru_cache(maxsize=4096, typed=True)
 def column_to_letter(column: int) -> str:
     """
     Convert column number to Excel column letter.
@@ -47,24 +61,176 @@ def column_to_letter(column: int) -> str:
             return column
         raise ValueError(f"Invalid column number: {column}")
 
+    return _column_to_letter(column)
+
+
+_ALPHA = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+# All two-letter column names AA..ZZ in order
+_ALPHA2 = tuple(a + b for a in _ALPHA for b in _ALPHA)
+
+
+def _column_to_letter(column: int) -> str:
+    c = column - 1
+    if c < 26:
+        return _ALPHA[c]
+    if c < 702:  # 26 + 26 * 26
+        return _ALPHA2[c - 26]
+    c -= 702
+    if c < 17576:  # 26 ** 3
+        a, r = divmod(c, 676)
+        return _ALPHA[a] + _ALPHA2[r]
+
+    # Beyond ZZZ (past Excel's limit); fall back to the general conversion
     result = ""
     while column > 0:
         remainder = (column - 1) % 26
-        result = chr(ord('A') + remainder) + result
+        result = _ALPHA[remainder] + result
         column = (column - 1) // 26
-
     return result
 
 
-def serialize_cell(cell):
-    """Serialize a cell to a JSON-serializable dictionary object with null checks"""
+# Property groups read by serialize_cell
+FIELDS_VALUE = 1
+FIELDS_FORMULA = 2
+FIELDS_FONT = 4
+FIELDS_FILL = 8
+FIELDS_BORDER = 16
+FIELDS_NUMFMT = 32
+FIELDS_MERGE = 64
+FIELDS_ALIGNMENT = 128
+FIELDS_ALL = 255
+_FIELDS_STYLE = FIELDS_FONT | FIELDS_FILL | FIELDS_BORDER | FIELDS_NUMFMT | FIELDS_ALIGNMENT
+
+# Sentinel for getattr lookups where None is a legitimate attribute value
+_MISSING = object()
+
+# (key, Spire attribute) pairs read by the generic fallback of the section builders
+_FONT_FIELDS = (("bold", "IsBold"), ("italic", "IsItalic"), ("name", "FontName"), ("size", "Size"))
+_ALIGNMENT_FIELDS = (
+    ("horizontal_alignment", "HorizontalAlignment"),
+    ("vertical_alignment", "VerticalAlignment"),
+    ("wrap_text", "WrapText"),
+    ("rotation", "Rotation"),
+    ("indent_level", "IndentLevel"),
+)
+_BORDER_POSITIONS = (("top", "Top"), ("bottom", "Bottom"), ("left", "Left"), ("right", "Right"))
+
+
+def _read_fields(obj, fields) -> dict:
+    """Generic path: read whichever of the given attributes obj exposes."""
+    values = {}
+    for key, attr in fields:
+        value = getattr(obj, attr, _MISSING)
+        if value is not _MISSING:
+            values[key] = value
+    return values
+
+
+def _serialize_color(color) -> Optional[dict]:
+    """Return a color as an {r, g, b} dict, or None if it can't be read."""
+    try:
+        return {"r": color.R, "g": color.G, "b": color.B}
+    except Exception:
+        return None
+
+
+def _serialize_font(font) -> dict:
+    try:
+        font_dict = {
+            "bold": font.IsBold,
+            "italic": font.IsItalic,
+            "name": font.FontName,
+            "size": font.Size,
+        }
+    except AttributeError:
+        font_dict = _read_fields(font, _FONT_FIELDS)
+
+    color = getattr(font, "Color", _MISSING)
+    if color is not _MISSING:
+        color = _serialize_color(color)
+        if color is not None:
+            font_dict["color"] = color
+    underline = getattr(font, "Underline", _MISSING)
+    if underline is not _MISSING:
+        font_dict["underline"] = str(underline) != "None"
+    return font_dict
+
+
+def _serialize_alignment(style) -> dict:
+    try:
+        return {
+            "horizontal_alignment": str(style.HorizontalAlignment),
+            "vertical_alignment": str(style.VerticalAlignment),
+            "wrap_text": style.WrapText,
+            "rotation": style.Rotation,
+            "indent_level": style.IndentLevel,
+        }
+    except AttributeError:
+        alignment = _read_fields(style, _ALIGNMENT_FIELDS)
+        for key in ("horizontal_alignment", "vertical_alignment"):
+            if key in alignment:
+                alignment[key] = str(alignment[key])
+        return alignment
+
+
+def _serialize_fill(interior) -> dict:
+    interior_dict = {}
+    color = getattr(interior, "Color", _MISSING)
+    if color is not _MISSING:
+        color = _serialize_color(color)
+        if color is not None:
+            interior_dict["color"] = color
+    pattern = getattr(interior, "FillPattern", _MISSING)
+    if pattern is not _MISSING:
+        interior_dict["pattern"] = str(pattern)
+    return interior_dict
+
+
+def _serialize_border(border) -> dict:
+    border_info = {}
+    line_style = getattr(border, "LineStyle", _MISSING)
+    if line_style is not _MISSING:
+        border_info["line_style"] = str(line_style)
+    color = getattr(border, "Color", _MISSING)
+    if color is not _MISSING:
+        color = _serialize_color(color)
+        if color is not None:
+            border_info["color"] = color
+    return border_info
+
+
+def _serialize_borders(borders) -> dict:
+    borders_dict = _serialize_border(borders)
+
+    # Individual borders
+    for key, pos in _BORDER_POSITIONS:
+        try:
+            border = getattr(borders, pos, None)
+            if border is not None:
+                border_info = _serialize_border(border)
+                if border_info:
+                    borders_dict[key] = border_info
+        except Exception:
+            pass
+    return borders_dict
+
+
+def serialize_cell(cell, col_letter: Optional[str] = None, fields: int = FIELDS_ALL):
+    """Serialize a cell to a JSON-serializable dictionary object with null checks.
+
+    col_letter may be passed by range walkers that already know the cell's column letter.
+    fields is a combination of FIELDS_* flags selecting which properties to read.
+    """
     try:
         # Basic properties
+        column = getattr(cell, "Column", None)
+        if col_letter is None and column is not None:
+            col_letter = column_to_letter(column)
         result = {
-            "address": cell.RangeAddressLocal if hasattr(cell, "RangeAddressLocal") else None,
-            "row": cell.Row if hasattr(cell, "Row") else None,
-            "column": cell.Column if hasattr(cell, "Column") else None,
-            "column_letter": column_to_letter(cell.Column) if hasattr(cell, "Column") else None,
+            "address": getattr(cell, "RangeAddressLocal", None),
+            "row": getattr(cell, "Row", None),
+            "column": column,
+            "column_letter": col_letter,
             "value": None,
             "text": None,
             "formula": None,
@@ -72,182 +238,114 @@ def serialize_cell(cell):
         }
 
         # Value handling (handle different types of values)
-        try:
-            result["value"] = cell.Value
-        except:
-            pass
-
-        try:
-            result["formula_value"] = cell.FormulaValue
-        except:
-            pass
-
-        try:
-            result["text"] = cell.Text
-        except:
-            pass
+        if fields & FIELDS_VALUE:
+            try:
+                result["value"] = cell.Value
+            except Exception:
+                pass
+
+            try:
+                result["formula_value"] = cell.FormulaValue
+            except Exception:
+                pass
+
+            try:
+                result["text"] = cell.Text
+            except Exception:
+                pass
 
         # Formula handling
-        try:
-            result["has_formula"] = cell.HasFormula
-            if cell.HasFormula:
-                result["formula"] = cell.Formula
-        except:
-            pass
+        if fields & FIELDS_FORMULA:
+            try:
+                has_formula = cell.HasFormula
+                result["has_formula"] = has_formula
+                if has_formula:
+                    result["formula"] = cell.Formula
+            except Exception:
+                pass
 
         # Style handling
         style_dict = {}
-
-        # Font handling
-        try:
-            font_dict = {}
-            if hasattr(cell, "Style") and hasattr(cell.Style, "Font"):
-                font = cell.Style.Font
-                if hasattr(font, "IsBold"):
-                    font_dict["bold"] = font.IsBold
-                if hasattr(font, "IsItalic"):
-                    font_dict["italic"] = font.IsItalic
-                if hasattr(font, "FontName"):
-                    font_dict["name"] = font.FontName
-                if hasattr(font, "Size"):
-                    font_dict["size"] = font.Size
-                if hasattr(font, "Color"):
-                    try:
-                        font_dict["color"] = {
-                            "r": font.Color.R,
-                            "g": font.Color.G,
-                            "b": font.Color.B
-                        }
-                    except:
-                        pass
-                if hasattr(font, "Underline"):
-                    font_dict["underline"] = str(font.Underline) != "None"
-
-            if font_dict:
-                style_dict["font"] = font_dict
-        except:
-            pass
-
-        # Alignment handling
-        try:
-            if hasattr(cell, "Style"):
-                if hasattr(cell.Style, "HorizontalAlignment"):
-                    style_dict["horizontal_alignment"] = str(cell.Style.HorizontalAlignment)
-                if hasattr(cell.Style, "VerticalAlignment"):
-                    style_dict["vertical_alignment"] = str(cell.Style.VerticalAlignment)
-                if hasattr(cell.Style, "WrapText"):
-                    style_dict["wrap_text"] = cell.Style.WrapText
-                if hasattr(cell.Style, "Rotation"):
-                    style_dict["rotation"] = cell.Style.Rotation
-                if hasattr(cell.Style, "IndentLevel"):
-                    style_dict["indent_level"] = cell.Style.IndentLevel
-        except:
-            pass
-
-        # Fill handling
-        try:
-            if hasattr(cell, "Style") and hasattr(cell.Style, "Interior"):
-                interior_dict = {}
-                interior = cell.Style.Interior
-                if hasattr(interior, "Color"):
-                    try:
-                        interior_dict["color"] = {
-                            "r": interior.Color.R,
-                            "g": interior.Color.G,
-                            "b": interior.Color.B
-                        }
-                    except:
-                        pass
-                if hasattr(interior, "FillPattern"):
-                    interior_dict["pattern"] = str(interior.FillPattern)
-
-                if interior_dict:
-                    style_dict["fill"] = interior_dict
-        except:
-            pass
-
-        # Borders handling
-        try:
-            if hasattr(cell, "Style") and hasattr(cell.Style, "Borders"):
-                borders_dict = {}
-                borders = cell.Style.Borders
-
-                if hasattr(borders, "LineStyle"):
-                    borders_dict["line_style"] = str(borders.LineStyle)
-                if hasattr(borders, "Color"):
-                    try:
-                        borders_dict["color"] = {
-                            "r": borders.Color.R,
-                            "g": borders.Color.G,
-                            "b": borders.Color.B
-                        }
-                    except:
-                        pass
-
-                # Individual borders
-                border_positions = ["Top", "Bottom", "Left", "Right"]
-                for pos in border_positions:
-                    try:
-                        if hasattr(borders, pos):
-                            border = getattr(borders, pos)
-                            border_info = {}
-                            if hasattr(border, "LineStyle"):
-                                border_info["line_style"] = str(border.LineStyle)
-                            if hasattr(border, "Color"):
-                                try:
-                                    border_info["color"] = {
-                                        "r": border.Color.R,
-                                        "g": border.Color.G,
-                                        "b": border.Color.B
-                                    }
-                                except:
-                                    pass
-                            if border_info:
-                                borders_dict[pos.lower()] = border_info
-                    except:
-                        pass
-
-                if borders_dict:
-                    style_dict["borders"] = borders_dict
-        except:
-            pass
-
-        # Number format
-        try:
-            if hasattr(cell, "Style") and hasattr(cell.Style, "NumberFormat"):
-                style_dict["number_format"] = cell.Style.NumberFormat
-        except:
-            pass
-
-        # Cell protection
-        try:
-            if hasattr(cell, "Style"):
-                protection_dict = {}
-                if hasattr(cell.Style, "HideFormula"):
-                    protection_dict["hide_formula"] = cell.Style.HideFormula
-
-                if protection_dict:
-                    style_dict["protection"] = protection_dict
-        except:
-            pass
+        style = None
+        if fields & _FIELDS_STYLE:
+            try:
+                style = getattr(cell, "Style", None)
+            except Exception:
+                style = None
+
+        if style is not None:
+            # Font handling
+            if fields & FIELDS_FONT:
+                try:
+                    font = getattr(style, "Font", None)
+                    if font is not None:
+                        font_dict = _serialize_font(font)
+                        if font_dict:
+                            style_dict["font"] = font_dict
+                except Exception:
+                    pass
+
+            # Alignment handling
+            if fields & FIELDS_ALIGNMENT:
+                try:
+                    style_dict.update(_serialize_alignment(style))
+                except Exception:
+                    pass
+
+            # Fill handling
+            if fields & FIELDS_FILL:
+                try:
+                    interior = getattr(style, "Interior", None)
+                    if interior is not None:
+                        interior_dict = _serialize_fill(interior)
+                        if interior_dict:
+                            style_dict["fill"] = interior_dict
+                except Exception:
+                    pass
+
+            # Borders handling
+            if fields & FIELDS_BORDER:
+                try:
+                    borders = getattr(style, "Borders", None)
+                    if borders is not None:
+                        borders_dict = _serialize_borders(borders)
+                        if borders_dict:
+                            style_dict["borders"] = borders_dict
+                except Exception:
+                    pass
+
+            # Number format and cell protection
+            if fields & FIELDS_NUMFMT:
+                try:
+                    number_format = getattr(style, "NumberFormat", _MISSING)
+                    if number_format is not _MISSING:
+                        style_dict["number_format"] = number_format
+                    hide_formula = getattr(style, "HideFormula", _MISSING)
+                    if hide_formula is not _MISSING:
+                        style_dict["protection"] = {"hide_formula": hide_formula}
+                except Exception:
+                    pass
 
         # Add style to result
         if style_dict:
             result["style"] = style_dict
 
         # Cell type
-        try:
-            if hasattr(cell, "Type"):
-                result["cell_type"] = str(cell.Type)
-        except:
-            pass
+        if fields & FIELDS_VALUE:
+            try:
+                cell_type = getattr(cell, "Type", _MISSING)
+                if cell_type is not _MISSING:
+                    result["cell_type"] = str(cell_type)
+            except Exception:
+                pass
 
         # Merged cells information
-        try:
-            if hasattr(cell, "IsMerged"):
-                result["is_merged"] = cell.IsMerged
-                if cell.IsMerged and hasattr(cell, "MergeArea"):
-                    try:
+        if fields & FIELDS_MERGE:
+            try:
+                is_merged = getattr(cell, "IsMerged", _MISSING)
+                if is_merged is not _MISSING:
+                    result["is_merged"] = is_merged
+                    if is_merged:
                         area = cell.MergeArea
                         result["merge_area"] = {
                             "first_row": area.FirstRow,
@@ -255,10 +353,8 @@ def serialize_cell(cell):
                             "last_row": area.LastRow,
                             "last_column": area.LastColumn
                         }
-                    except:
-                        pass
-        except:
-            pass
+            except Exception:
+                pass
 
         return result
     except Exception as e:
@@ -271,42 +367,170 @@ def serialize_cell(cell):
         }
 
 
+def serialize_cells_in_range(
+        sheet,
+        first_col: int,
+        last_col: int,
+        first_row: int,
+        last_row: int,
+        fields: int = FIELDS_ALL
+) -> dict:
+    """
+    Serialize a block of cells in column-first form: result[column_letter][row].
+
+    The block's cells are fetched with a single Cells call instead of indexing
+    the sheet once per cell, and column letters are computed once per column.
+    """
+    letters = [column_to_letter(col) for col in range(first_col, last_col + 1)]
+    data = {letter: {} for letter in letters}
+
+    # Cells is row-major, so a cell's column follows from its position in the block
+    width = len(letters)
+    block = sheet.Range[first_row, first_col, last_row, last_col]
+    for i, cell in enumerate(block.Cells):
+        col_letter = letters[i % width]
+        cell_data = serialize_cell(cell, col_letter=col_letter, fields=fields)
+        row = cell_data.get("row")
+        if row is None:
+            continue
+        data[col_letter][row] = cell_data
+    return data
+
+
+def serialize_range_columnar(
+        sheet,
+        first_col: int,
+        last_col: int,
+        first_row: int,
+        last_row: int,
+        fields: int = FIELDS_ALL
+) -> dict:
+    """
+    Serialize a block of cells as parallel per-column lists.
+
+    Each column holds "values" and "formulas" lists indexed by row offset from
+    first_row. When style fields are requested it also holds "styles" as
+    [style, run_length] pairs, one per run of rows sharing the same style.
+    Merge information is not included.
+    """
+    letters = [column_to_letter(col) for col in range(first_col, last_col + 1)]
+    with_style = bool(fields & _FIELDS_STYLE)
+    columns = []
+    for _ in letters:
+        column = {"values": [], "formulas": []}
+        if with_style:
+            column["styles"] = []
+        columns.append(column)
+
+    # Cells is row-major, so the cell at position i belongs to column i % width
+    width = len(letters)
+    block = sheet.Range[first_row, first_col, last_row, last_col]
+    for i, cell in enumerate(block.Cells):
+        cell_data = serialize_cell(cell, fields=fields & ~FIELDS_MERGE)
+        column = columns[i % width]
+        column["values"].append(cell_data.get("value"))
+        column["formulas"].append(cell_data.get("formula"))
+        if with_style:
+            style = cell_data.get("style")
+            runs = column["styles"]
+            if runs and runs[-1][0] == style:
+                runs[-1][1] += 1
+            else:
+                runs.append([style, 1])
+
+    return {
+        "first_row": first_row,
+        "last_row": last_row,
+        "columns": dict(zip(letters, columns))
+    }
+
+
 def parse_cell_range(
         start_cell: str,
         end_cell: Optional[str] = None,
-        workbook: Workbook = Workbook()
+        workbook: Optional[Workbook] = None
 ) -> Tuple[int, int, Optional[int], Optional[int]]:
     """Parse Excel cell references into row and column numbers."""
-    try:
-        start_cell = workbook.Worksheets[0].Range[start_cell]
-    except:
-        raise ValueError(f"Invalid start cell reference: {start_cell}")
-    start_col = start_cell.Column
-    start_row = start_cell.Row
+    start_row, start_col = _parse_cell_ref(start_cell, workbook, "start")
     # Parse end cell if provided
     end_col = None
     end_row = None
     if end_cell:
-        try:
-            end_cell = workbook.Worksheets[0].Range[end_cell]
-        except:
-            raise ValueError(f"Invalid end cell reference: {end_cell}")
-        end_col = end_cell.Column
-        end_row = end_cell.Row
+        end_row, end_col = _parse_cell_ref(end_cell, workbook, "end")
 
     return start_row, start_col, end_row, end_col
 
 
-def validate_cell_reference_regex(cell_ref: str) -> bool:
+def _parse_cell_ref(cell_ref: str, workbook: Optional[Workbook], kind: str) -> Tuple[int, int]:
+    """Return (row, column) for a cell reference, falling back to Spire for unusual forms."""
+    parsed = parse_ref_fast(cell_ref.replace('$', '')) if isinstance(cell_ref, str) else None
+    if parsed is not None:
+        return parsed[1], parsed[0]
+
+    try:
+        if workbook is not None:
+            cell = workbook.Worksheets[0].Range[cell_ref]
+            return cell.Row, cell.Column
+        with _SCRATCH_WB_LOCK:
+            cell = _scratch_workbook().Worksheets[0].Range[cell_ref]
+            return cell.Row, cell.Column
+    except Exception:
+        raise ValueError(f"Invalid {kind} cell reference: {cell_ref}")
+
+
+# Shared workbook for resolving references Spire-side; Spire objects aren't thread-safe
+_SCRATCH_WB = None
+_SCRATCH_WB_LOCK = threading.Lock()
+
+
+def _scratch_workbook() -> Workbook:
+    global _SCRATCH_WB
+    if _SCRATCH_WB is None:
+        _SCRATCH_WB = Workbook()
+    return _SCRATCH_WB
+
+
+@functools.lru_cache(maxsize=20000)
+def parse_ref_fast(cell_ref: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse an A1-style cell reference without a regex or a workbook.
+
+    Args:
+        cell_ref: Cell reference such as "B12" (1-3 letters followed by a row number)
+
+    Returns:
+        (column, row) tuple, or None if the reference is not valid
+    """
+    if not cell_ref or not cell_ref.isascii():
+        return None
+
+    raw = cell_ref.encode('ascii')
+    column = 0
+    i = 0
+    for b in raw:
+        value = _LETTER_VAL[b]
+        if not value:
+            break
+        column = column * 26 + value
+        i += 1
+
+    digits = raw[i:]
+    if not 1 <= i <= 3 or not digits.isdigit() or digits[0] == ord('0'):
+        return None
+    return column, int(digits)
+
+
+def validate_cell_reference(cell_ref: str) -> bool:
     """Validate Excel cell reference format."""
-    if not cell_ref:
-        return False
+    return parse_ref_fast(cell_ref) is not None
+
 
-    # Basic format validation
-    pattern = r'^[A-Za-z]{1,3}[1-9][0-9]*$'
-    if not re.match(pattern, cell_ref):
-        return False
-    return True
+validate_cell_reference_regex = validate_cell_reference
+
+
+@functools.lru_cache(maxsize=512)
+def _normalize_enum_key(input_str: str) -> str:
+    return input_str.strip().lower()
 
 
 class EnumMapper:
@@ -390,6 +614,13 @@ class EnumMapper:
         "scatter": ExcelChartType.ScatterLine,
         "doughnut": ExcelChartType.Doughnut,
     }
+    # chart legend position
+    LEGEND_POSITION_MAP = {
+        "right": LegendPositionType.Right,
+        "left": LegendPositionType.Left,
+        "top": LegendPositionType.Top,
+        "bottom": LegendPositionType.Bottom,
+    }
     # conditional format type
     CONDITION_TYPE_MAP = {
         "cell": ConditionalFormatType.CellValue,
@@ -422,8 +653,7 @@ class EnumMapper:
     def smart_enum_map(input_str: str, mapping: dict, default):
         if not input_str:
             return default
-        key = input_str.strip().lower()
-        return mapping.get(key, default)
+        return mapping.get(_normalize_enum_key(input_str), default)
 
     @classmethod
     def get_operator_enum(cls, op_str: str) -> ComparisonOperatorType:
@@ -454,6 +684,31 @@ class EnumMapper:
         return cls.smart_enum_map(op_str, cls.FILTER_OPERATOR_MAP, FilterOperatorType.Equal)
 
 
+def _make_int(value: int) -> Any:
+    if -2147483648 <= value <= 2147483647:
+        return Int32(value)
+    return Int64(value)
+
+
+def _make_datetime(value) -> Any:
+    return DateTime(value.year, value.month, value.day,
+                    getattr(value, 'hour', 0),
+                    getattr(value, 'minute', 0),
+                    getattr(value, 'second', 0),
+                    getattr(value, 'microsecond', 0) // 1000)
+
+
+# Exact value type -> SpireObject constructor
+_SPIRE_FACTORIES = {
+    bool: Boolean,
+    int: _make_int,
+    float: Double,
+    str: String,
+    datetime.datetime: _make_datetime,
+    datetime.date: _make_datetime,
+}
+
+
 def create_spire_object(value: Any) -> Any:
     """
     Create corresponding SpireObject based on the input value's type.
@@ -474,26 +729,13 @@ def create_spire_object(value: Any) -> Any:
     if value is None:
         return String("")
 
-    if isinstance(value, bool):
-        return Boolean(value)
-
-    if isinstance(value, int):
-        if -2147483648 <= value <= 2147483647:
-            return Int32(value)
-        else:
-            return Int64(value)
-
-    if isinstance(value, float):
-        return Double(value)
-
-    if isinstance(value, str):
-        return String(value)
+    factory = _SPIRE_FACTORIES.get(type(value))
+    if factory is not None:
+        return factory(value)
 
-    if isinstance(value, (datetime.datetime, datetime.date)):
-        return DateTime(value.year, value.month, value.day,
-                        getattr(value, 'hour', 0),
-                        getattr(value, 'minute', 0),
-                        getattr(value, 'second', 0),
-                        getattr(value, 'microsecond', 0))
+    # Subclasses of the supported types (bool is listed before int)
+    for base, factory in _SPIRE_FACTORIES.items():
+        if isinstance(value, base):
+            return factory(value)
 
     return String(str(value))
@@ -1,12 +1,240 @@
+import atexit
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from io import BytesIO
+from itertools import repeat
 from typing import Any, Dict, Optional
 
 from spire.xls import *
 
 from .exceptions import ConversionError
+from .workbook import get_workbook, get_sheet, open_workbook, read_sheet_names, workbook_lock
+
+try:
+    # Optional: re-encodes rendered images as JPEG or at a chosen PNG compression level
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
 
 logger = logging.getLogger(__name__)
 
+# PDF options that change sheet page setup
+_PAGE_SETUP_OPTIONS = ('orientation', 'paper_size', 'fit_to_page')
+
+# Option values and format types mapped to Spire enums
+_ORIENTATIONS = {
+    'landscape': PageOrientationType.Landscape,
+    'portrait': PageOrientationType.Portrait
+}
+_PAPER_SIZES = {
+    'a4': PaperSizeType.PaperA4,
+    'letter': PaperSizeType.PaperLetter
+}
+_EXCEL_FORMATS = {
+    'xlsx': FileFormat.Version2013,
+    'xls': FileFormat.Version97to2003,
+    'ods': FileFormat.ODS,
+    'xml': FileFormat.XML,
+    'uos': FileFormat.UOS
+}
+
+# Per-sheet worker pools keyed by size, kept across calls so each worker
+# process loads Spire once rather than once per conversion
+_POOLS: dict[int, ProcessPoolExecutor] = {}
+_POOLS_GUARD = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared worker pool with the given number of processes.
+
+    Workers are spawned rather than forked: the server process runs threads
+    and has the native Spire runtime loaded, which a forked child can't use safely.
+    """
+    with _POOLS_GUARD:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = _POOLS[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return pool
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    """Stop every worker pool when the process exits."""
+    with _POOLS_GUARD:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _drop_pool(workers: int) -> None:
+    """Forget a pool whose worker died so the next call starts a fresh one."""
+    with _POOLS_GUARD:
+        pool = _POOLS.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+
+def _merge_pdfs(paths: list[str], output_filepath: str) -> bool:
+    """Concatenate per-sheet PDFs into output_filepath and remove the parts.
+
+    Returns False, leaving the parts in place, when pypdf is not installed.
+    """
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        logger.warning("pypdf is not installed; leaving one PDF per sheet")
+        return False
+
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+    with open(output_filepath, 'wb') as f:
+        writer.write(f)
+    writer.close()
+    for path in paths:
+        os.remove(path)
+    return True
+
+
+def _image_encoding(output_filepath: str, options: Optional[Dict[str, Any]]) -> tuple[bool, Optional[int]]:
+    """Return (as_jpeg, png_compress_level) for an image conversion.
+
+    Spire renders PNG. JPEG output (image_type "jpg"/"jpeg" or a .jpg/.jpeg
+    path) and an explicit png_compress_level need Pillow to re-encode the
+    image; ConversionError is raised up front when it is not installed.
+    """
+    options = options or {}
+    image_type = str(options.get('image_type', '')).lower()
+    ext = os.path.splitext(output_filepath)[1].lower()
+    as_jpeg = image_type in ('jpg', 'jpeg') or (not image_type and ext in ('.jpg', '.jpeg'))
+    png_level = options.get('png_compress_level')
+
+    if (as_jpeg or png_level is not None) and PILImage is None:
+        raise ConversionError("Pillow is required for JPEG output and png_compress_level")
+    return as_jpeg, png_level
+
+
+def _save_image(stream, output_filepath: str, options: Optional[Dict[str, Any]]) -> None:
+    """Write a rendered sheet image, re-encoding it with Pillow only when asked to."""
+    as_jpeg, png_level = _image_encoding(output_filepath, options)
+    if not as_jpeg and png_level is None:
+        stream.Save(output_filepath)
+        return
+
+    with PILImage.open(BytesIO(bytes(stream.ToArray()))) as img:
+        if as_jpeg:
+            img.convert('RGB').save(output_filepath, 'JPEG', quality=int((options or {}).get('jpeg_quality', 85)))
+        else:
+            img.save(output_filepath, 'PNG', compress_level=int(png_level))
+
+
+def _apply_page_setup(sheets, options: Dict[str, Any]) -> None:
+    """Apply the PDF page setup options to the given worksheets."""
+    # Resolve page setup options once, then apply them to every sheet
+    orientation = None
+    if 'orientation' in options:
+        orientation = _ORIENTATIONS.get(options['orientation'].lower())
+
+    paper_size = None
+    if 'paper_size' in options:
+        paper_size = _PAPER_SIZES.get(options['paper_size'].lower())
+
+    fit_to_page = bool(options.get('fit_to_page'))
+
+    if orientation is None and paper_size is None and not fit_to_page:
+        return
+    for sheet in sheets:
+        page_setup = sheet.PageSetup
+        if orientation is not None:
+            page_setup.Orientation = orientation
+        if paper_size is not None:
+            page_setup.PaperSize = paper_size
+        if fit_to_page:
+            page_setup.FitToPagesWide = 1
+            page_setup.FitToPagesTall = 1
+
+
+def _save_sheet_image(sheet, output_filepath: str, options: Optional[Dict[str, Any]],
+                      cell_range: str = None) -> None:
+    """Render a worksheet (or one range of it) to an image file."""
+    if cell_range:
+        save_range = sheet.Range[cell_range]
+        row, column, end_row, end_column = (
+            save_range.Row, save_range.Column, save_range.LastRow, save_range.LastColumn)
+        stream = sheet.ToImage(row, column, end_row, end_column)
+        _save_image(stream, output_filepath, options)
+        return
+
+    # Start from the used range and only widen it for shapes hanging past it
+    lastColumn = sheet.LastColumn
+    lastRow = sheet.LastRow
+    # TODO replace with sheet.SaveToImage(filePath)
+    pictures = sheet.Pictures
+    if pictures.Count:
+        for pic in pictures:
+            lastColumn = max(pic.RightColumn, lastColumn)
+            lastRow = max(pic.BottomRow, lastRow)
+    shapes = sheet.PrstGeomShapes
+    if shapes.Count:
+        for pic in shapes:
+            lastColumn = max(pic.RightColumn, lastColumn)
+            lastRow = max(pic.BottomRow, lastRow)
+    stream = sheet.ToImage(sheet.FirstRow, sheet.FirstColumn, lastRow, lastColumn)
+    _save_image(stream, output_filepath, options)
+
+
+def _convert_one_sheet(filepath: str, sheet_name: str, output_filepath: str,
+                       format_type: str, options: Dict[str, Any]) -> str:
+    """Convert a single worksheet to PDF or an image; runs in a worker process."""
+    with open_workbook(filepath) as wb:
+        sheet = get_sheet(wb, sheet_name)
+        if sheet is None:
+            raise ConversionError(f"Sheet '{sheet_name}' not found")
+        if format_type == 'pdf':
+            _apply_page_setup([sheet], options)
+            sheet.SaveToPdf(output_filepath)
+        else:
+            _save_sheet_image(sheet, output_filepath, options)
+    return output_filepath
+
+
+def _convert_per_sheet(filepath: str, output_filepath: str, format_type: str,
+                       options: Dict[str, Any], sheet_name: str = None) -> list[str]:
+    """Write one PDF/image per worksheet, rendering sheets in parallel processes.
+
+    Spire workbooks are not thread-safe, so every worker process loads its own
+    copy of the file from disk; unsaved changes in the workbook cache are not
+    included. The sheets are listed from the file on disk too, so sheets only
+    added or renamed in the cache aren't sent to the workers. Output files are
+    named "<output stem>_<sheet name><ext>".
+    """
+    if sheet_name:
+        sheet_names = [sheet_name]
+    else:
+        sheet_names = read_sheet_names(filepath)
+
+    base, ext = os.path.splitext(output_filepath)
+    output_files = [f"{base}_{name}{ext}" for name in sheet_names]
+
+    workers = min(int(options.get('workers') or os.cpu_count() or 1), len(sheet_names))
+    if workers <= 1:
+        return [_convert_one_sheet(filepath, name, out, format_type, options)
+                for name, out in zip(sheet_names, output_files)]
+
+    try:
+        return list(_get_pool(workers).map(
+            _convert_one_sheet, repeat(filepath), sheet_names, output_files,
+            repeat(format_type), repeat(options)))
+    except BrokenProcessPool:
+        _drop_pool(workers)
+        raise
+
 
 def convert_workbook(
         filepath: str,
@@ -31,155 +259,120 @@ def convert_workbook(
         Dictionary with operation status
     """
     try:
-        # Load the workbook
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
+        format_type = format_type.lower()
 
         # Ensure output directory exists
         output_dir = os.path.dirname(output_filepath)
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
 
-        # Handle format-specific conversion
-        format_type = format_type.lower()
-
-        # Find specific sheet if needed
-        target_sheet = None
-        if sheet_name:
-            for ws in wb.Worksheets:
-                if ws.Name == sheet_name:
-                    target_sheet = ws
-                    break
+        if format_type == 'image':
+            # Fail before rendering anything if the image can't be encoded as asked
+            _image_encoding(output_filepath, options)
 
-            if target_sheet is None and (format_type == 'csv' or format_type == 'txt' or cell_range):
-                raise ConversionError(f"Sheet '{sheet_name}' not found")
+        if options and options.get('per_sheet') and format_type in ('pdf', 'image'):
+            output_files = _convert_per_sheet(filepath, output_filepath, format_type, options, sheet_name)
+            if format_type == 'pdf' and options.get('merge') and _merge_pdfs(output_files, output_filepath):
+                return {
+                    "message": f"Excel file successfully converted to PDF: {output_filepath}",
+                    "source_file": filepath,
+                    "output_file": output_filepath,
+                    "format": format_type
+                }
+            return {
+                "message": f"Excel file successfully converted to {len(output_files)} {format_type.upper()} file(s)",
+                "source_file": filepath,
+                "output_files": output_files,
+                "format": format_type
+            }
 
-        # Process different format types
-        if format_type == 'pdf':
-            # Configure PDF options
-            if options:
-                # Apply page setup options
-                for sheet in wb.Worksheets:
-                    if sheet_name and sheet.Name != sheet_name:
-                        continue
-
-                    if 'orientation' in options:
-                        orientation = options['orientation'].lower()
-                        if orientation == 'landscape':
-                            sheet.PageSetup.Orientation = PageOrientationType.Landscape
-                        elif orientation == 'portrait':
-                            sheet.PageSetup.Orientation = PageOrientationType.Portrait
-
-                    if 'paper_size' in options:
-                        paper_size = options['paper_size'].lower()
-                        if paper_size == 'a4':
-                            sheet.PageSetup.PaperSize = PaperSizeType.PaperA4
-                        elif paper_size == 'letter':
-                            sheet.PageSetup.PaperSize = PaperSizeType.PaperLetter
-
-                    if 'fit_to_page' in options and options['fit_to_page']:
-                        sheet.PageSetup.FitToPagesWide = 1
-                        sheet.PageSetup.FitToPagesTall = 1
-
-            # Convert to PDF
-            if sheet_name and target_sheet:
-                target_sheet.SaveToPdf(output_filepath)
+        with workbook_lock(filepath), ExitStack() as stack:
+            # Load the workbook. PDF page setup mutates the sheets, so that case
+            # works on a private copy instead of the shared cached workbook.
+            page_setup = format_type == 'pdf' and options and any(key in options for key in _PAGE_SETUP_OPTIONS)
+            if page_setup:
+                wb = stack.enter_context(open_workbook(filepath))
             else:
-                wb.SaveToFile(output_filepath, FileFormat.PDF)
+                wb = get_workbook(filepath)
+
+            # Find specific sheet if needed
+            target_sheet = None
+            if sheet_name:
+                target_sheet = get_sheet(wb, sheet_name)
+                if target_sheet is None and (format_type == 'csv' or format_type == 'txt' or cell_range):
+                    raise ConversionError(f"Sheet '{sheet_name}' not found")
+
+            # Process different format types
+            if format_type == 'pdf':
+                # Configure PDF options
+                if page_setup:
+                    if target_sheet is not None:
+                        sheets_to_configure = [target_sheet]
+                    elif sheet_name:
+                        sheets_to_configure = []
+                    else:
+                        sheets_to_configure = list(wb.Worksheets)
+                    _apply_page_setup(sheets_to_configure, options)
+
+                # Convert to PDF
+                if target_sheet is not None:
+                    target_sheet.SaveToPdf(output_filepath)
+                else:
+                    wb.SaveToFile(output_filepath, FileFormat.PDF)
+
+            elif format_type == 'csv' or format_type == 'txt':
+                if target_sheet is None:
+                    raise ConversionError("Sheet name is required for CSV/TXT conversion")
 
-        elif format_type == 'csv' or format_type == 'txt':
-            if target_sheet is None:
-                raise ConversionError("Sheet name is required for CSV/TXT conversion")
+                if not options or not options['delimiter'] or not options['encoding']:
+                    raise ConversionError("options delimiter、encoding is required for CSV/TXT conversion")
 
-            if not options or not options['delimiter'] or not options['encoding']:
-                raise ConversionError("options delimiter、encoding is required for CSV/TXT conversion")
+                separator = options['delimiter']
+                encoding = Encoding.GetEncoding(str(options['encoding']))
+                # Convert to CSV/TXT
+                target_sheet.SaveToFile(output_filepath, separator, encoding)
 
-            separator = options['delimiter']
-            encoding = Encoding.GetEncoding(str(options['encoding']))
-            # Convert to CSV/TXT
-            target_sheet.SaveToFile(output_filepath, separator, encoding)
+            elif format_type == 'html':
+                # Configure HTML options
+                html_options = HTMLOptions()
 
-        elif format_type == 'html':
-            # Configure HTML options
-            html_options = HTMLOptions()
+                if options:
+                    if 'image_embedded' in options and not options['image_embedded']:
+                        html_options.ImageEmbedded = False
 
-            if options:
-                if 'image_embedded' in options and not options['image_embedded']:
-                    html_options.ImageEmbedded = False
+                    if 'image_locationType' in options and options['image_locationType'] == 0:
+                        html_options.ImageLocationType = ImageLocationTypes.GlobalAbsolute
+                    else:
+                        html_options.ImageLocationType = ImageLocationTypes.TableRelative
 
-                if 'image_locationType' in options and options['image_locationType'] == 0:
-                    html_options.ImageLocationType = ImageLocationTypes.GlobalAbsolute
+                # Convert to HTML
+                if target_sheet is not None:
+                    target_sheet.SaveToHtml(output_filepath, html_options)
                 else:
-                    html_options.ImageLocationType = ImageLocationTypes.TableRelative
+                    wb.SaveToFile(output_filepath, FileFormat.HTML)
 
-            # Convert to HTML
-            if sheet_name and target_sheet:
-                target_sheet.SaveToHtml(output_filepath, html_options)
-            else:
-                wb.SaveToFile(output_filepath, FileFormat.HTML)
-
-        elif format_type == 'image':
-            # Determine image format
-            # image_format = ImageFormatType.Png  # Default
-            #
-            # if options and 'image_type' in options:
-            #     img_type = options['image_type'].lower()
-            #     if img_type == 'jpg' or img_type == 'jpeg':
-            #         image_format = ImageFormatType.Jpeg
-            #     elif img_type == 'original':
-            #         image_format = ImageFormatType.Original
-
-            # Convert to image
-            if target_sheet is None:
-                if sheet_name:
-                    raise ConversionError(f"Sheet '{sheet_name}' not found")
-                target_sheet = wb.Worksheets[0]
-
-            if cell_range:
-                save_range = target_sheet.Range[cell_range]
-                row, column, end_row, end_column = (
-                    save_range.Row, save_range.Column, save_range.LastRow, save_range.LastColumn)
-                stream = target_sheet.ToImage(row, column, end_row, end_column)
-                stream.Save(output_filepath)
-            else:
-                lastColumn = 0
-                lastRow = 0
-                # TODO replace with target_sheet.SaveToImage(filePath)
-                for pic in target_sheet.Pictures:
-                    lastColumn = max(pic.RightColumn, lastColumn)
-                    lastRow = max(pic.BottomRow, lastRow)
-                for pic in target_sheet.PrstGeomShapes:
-                    lastColumn = max(pic.RightColumn, lastColumn)
-                    lastRow = max(pic.BottomRow, lastRow)
-                stream = target_sheet.ToImage(target_sheet.FirstRow, target_sheet.FirstColumn,
-                                              lastRow, lastColumn)
-                stream.Save(output_filepath)
-
-        elif format_type in ['xlsx', 'xls', 'ods', 'xml', 'uos']:
-            # Map format type to file format
-            format_map = {
-                'xlsx': FileFormat.Version2013,
-                'xls': FileFormat.Version97to2003,
-                'ods': FileFormat.ODS,
-                'xml': FileFormat.XML,
-                'uos': FileFormat.UOS
-            }
+            elif format_type == 'image':
+                # Convert to image
+                if target_sheet is None:
+                    if sheet_name:
+                        raise ConversionError(f"Sheet '{sheet_name}' not found")
+                    target_sheet = wb.Worksheets[0]
 
-            if format_type not in format_map:
-                raise ConversionError(f"Unsupported Excel format: {format_type}")
+                _save_sheet_image(target_sheet, output_filepath, options, cell_range)
 
-            # Convert to the specified format
-            wb.SaveToFile(output_filepath, format_map[format_type])
+            elif format_type in _EXCEL_FORMATS:
+                # Convert to the specified format
+                wb.SaveToFile(output_filepath, _EXCEL_FORMATS[format_type])
 
-        else:
-            raise ConversionError(f"Unsupported format type: {format_type}")
-
-        return {
-            "message": f"Excel file successfully converted to {format_type.upper()}: {output_filepath}",
-            "source_file": filepath,
-            "output_file": output_filepath,
-            "format": format_type
-        }
+            else:
+                raise ConversionError(f"Unsupported format type: {format_type}")
+
+            return {
+                "message": f"Excel file successfully converted to {format_type.upper()}: {output_filepath}",
+                "source_file": filepath,
+                "output_file": output_filepath,
+                "format": format_type
+            }
 
     except ConversionError as e:
         logger.error(str(e))
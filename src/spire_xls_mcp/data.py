@@ -5,8 +5,23 @@ import logging
 from spire.xls import *
 
 from .exceptions import DataError
-from .cell_utils import parse_cell_range, column_to_letter, serialize_cell
-from .workbook import get_or_create_workbook
+from .cell_utils import (
+    parse_cell_range,
+    serialize_cells_in_range,
+    serialize_range_columnar,
+    FIELDS_ALL,
+    FIELDS_VALUE,
+    FIELDS_FORMULA
+)
+from .workbook import (
+    get_or_create_workbook,
+    get_workbook,
+    get_sheet,
+    get_or_create_sheet,
+    save_workbook,
+    workbook_edit,
+    workbook_lock
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,58 +30,37 @@ def read_excel_range(
         filepath: Path | str,
         sheet_name: str,
         cell_range: str,
-        preview_only: bool = False
-) -> Dict[str, Dict[int, Any]]:
+        preview_only: bool = False,
+        columnar: bool = False
+) -> Dict[str, Any]:
     """
     Read data from Excel range with optional preview mode.
-    Returns data in column-first format where cells can be accessed as data[column_letter][row_number]
+    Returns data in column-first format where cells can be accessed as data[column_letter][row_number],
+    or with columnar=True as parallel per-column value/formula/style lists (see serialize_range_columnar)
     """
     try:
-        wb = Workbook()
-        wb.LoadFromFile(str(filepath))
-
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-        if sheet is None:
-            raise DataError(f"Sheet '{sheet_name}' not found")
-
-        ranges = sheet.Range[cell_range]
-
-        start_row, start_col, end_row, end_col = ranges.Row, ranges.Column, ranges.LastRow, ranges.LastColumn
-
-        # Initialize column-based structure
-        data = {}
-
-        # Create data structure organized by columns
-        for col in range(start_col, end_col + 1):
-            col_letter = column_to_letter(col)
-            data[col_letter] = {}
-
-            for row in range(start_row, end_row + 1):
-                cell = sheet.Range[row, col]
-                data[col_letter][row] = serialize_cell(cell)
-
-        # If preview mode, limit data (keep first 5 columns and first 5 rows)
-        if preview_only:
-            preview_data = {}
-            col_count = 0
-            for col_letter in data:
-                if col_count >= 5:
-                    break
-                preview_data[col_letter] = {}
-                row_count = 0
-                for row in sorted(data[col_letter].keys())[:5]:
-                    preview_data[col_letter][row] = data[col_letter][row]
-                    row_count += 1
-                    if row_count >= 5:
-                        break
-                col_count += 1
-            return preview_data
-
-        return data
+        with workbook_lock(filepath):
+            wb = get_workbook(filepath)
+
+            sheet = get_sheet(wb, sheet_name)
+            if sheet is None:
+                raise DataError(f"Sheet '{sheet_name}' not found")
+
+            ranges = sheet.Range[cell_range]
+
+            start_row, start_col, end_row, end_col = ranges.Row, ranges.Column, ranges.LastRow, ranges.LastColumn
+
+            # If preview mode, limit data (keep first 5 columns and first 5 rows)
+            if preview_only:
+                end_row = min(end_row, start_row + 4)
+                end_col = min(end_col, start_col + 4)
+
+            # Create data structure organized by columns
+            # Preview mode skips style information
+            fields = FIELDS_VALUE | FIELDS_FORMULA if preview_only else FIELDS_ALL
+            if columnar:
+                return serialize_range_columnar(sheet, start_col, end_col, start_row, end_row, fields)
+            return serialize_cells_in_range(sheet, start_col, end_col, start_row, end_row, fields)
     except DataError as e:
         logger.error(str(e))
         raise
@@ -78,29 +72,28 @@ def read_excel_range(
 def write_data(filepath: str, sheet_name: str, data: List[List], start_cell: str = "A1") -> dict[str, Any]:
     """Write data to Excel worksheet."""
     try:
-        wb = get_or_create_workbook(filepath)
-        sheet = None
-
-        # Find or create sheet
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-        if sheet is None:
-            sheet = wb.CreateEmptySheet(sheet_name)
-
-        # Parse start cell
-        cell_range = sheet.Range[start_cell]
-        start_row, start_col = cell_range.Row, cell_range.Column
-
-        # Write data
-        for i, row in enumerate(data):
-            for j, value in enumerate(row):
-                cell = sheet.Range[start_row + i, start_col + j]
-                cell.Value = str(value)
-
-        wb.SaveToFile(filepath)
-        return {"message": "Data written successfully"}
+        with workbook_edit(filepath):
+            wb = get_or_create_workbook(filepath)
+            sheet = get_or_create_sheet(wb, sheet_name)
+
+            # Parse start cell
+            cell_range = sheet.Range[start_cell]
+            start_row, start_col = cell_range.Row, cell_range.Column
+
+            # Write data through one block fetch; Cells is row-major, so row i
+            # starts at i * width. Short rows leave their padding cells untouched.
+            if data:
+                width = max((len(row) for row in data), default=0)
+                if width:
+                    cells = sheet.Range[start_row, start_col,
+                                        start_row + len(data) - 1, start_col + width - 1].Cells
+                    for i, row in enumerate(data):
+                        base = i * width
+                        for j, value in enumerate(row):
+                            cells[base + j].Value = str(value)
+
+            save_workbook(wb, filepath)
+            return {"message": "Data written successfully"}
     except Exception as e:
         logger.error(f"Failed to write data: {e}")
         raise DataError(f"Failed to write data: {e!s}")
@@ -109,7 +102,7 @@ def write_data(filepath: str, sheet_name: str, data: List[List], start_cell: str
 def _looks_like_headers(row_dict):
     """Check if a data row appears to be headers (keys match values)."""
     return all(
-        isinstance(value, str) and str(value).strip() == str(key).strip()
+        isinstance(value, str) and value.strip() == str(key).strip()
         for key, value in row_dict.items()
     )
 
@@ -119,36 +112,46 @@ def _check_for_headers_above(worksheet, start_row, start_col, headers):
     if start_row <= 1:
         return False  # Nothing above row 1
 
+    # Limit check to first 10 columns for performance
+    expected = [str(header).strip().lower() for header in headers[:10]]
+    first_row = max(1, start_row - 5)
+    if not expected or worksheet.LastRow < first_row:
+        return False  # Nothing to compare, or every row above is empty
+
+    # Fetch the whole block above in one call; Cells is row-major
+    width = len(expected)
+    cells = worksheet.Range[first_row, start_col, start_row - 1, start_col + width - 1].Cells
+
     # Look for header-like content above
-    for check_row in range(max(1, start_row - 5), start_row):
+    for offset, check_row in enumerate(range(first_row, start_row)):
         # Count matches for this row
         header_count = 0
-        cell_count = 0
-
-        for i, header in enumerate(headers):
-            if i >= 10:  # Limit check to first 10 columns for performance
-                break
-
-            cell = worksheet.Range[check_row, start_col + i]
-            cell_count += 1
+        base = offset * width
+        # A range reports IsBold only when every cell in it is bold; fetched on first need
+        row_bold = None
 
-            # Check if cell is formatted like a header (bold)
-            is_formatted = cell.Style.Font.IsBold
+        for i, header in enumerate(expected):
+            cell = cells[base + i]
+            text = cell.Text
 
             # Check for any content that could be a header
-            if cell.Text:
+            if text:
                 # Case 1: Direct match with expected header
-                if str(cell.Text).strip().lower() == str(header).strip().lower():
+                if text.strip().lower() == header:
                     header_count += 2  # Give higher weight to exact matches
-                # Case 2: Any formatted cell with content
-                elif is_formatted and cell.Text:
-                    header_count += 1
-                # Case 3: Any cell with content in the first row we check
-                elif check_row == max(1, start_row - 5):
-                    header_count += 0.5
+                # Case 2: Any formatted (bold) cell with content
+                else:
+                    if row_bold is None:
+                        row_bold = worksheet.Range[check_row, start_col,
+                                                   check_row, start_col + width - 1].Style.Font.IsBold
+                    if row_bold or cell.Style.Font.IsBold:
+                        header_count += 1
+                    # Case 3: Any cell with content in the first row we check
+                    elif check_row == first_row:
+                        header_count += 0.5
 
         # If we have a significant number of matching cells, consider it a header row
-        if cell_count > 0 and header_count >= cell_count * 0.5:
+        if header_count >= width * 0.5:
             return True
 
     # No headers found above
@@ -212,10 +215,10 @@ def _write_data_to_worksheet(
         except ValueError as e:
             raise DataError(f"Invalid start cell format: {str(e)}")
 
-        # Write data
+        # Write data one row per call; InsertArray stores strings as text like .Text does
         for i, row in enumerate(data):
-            for j, val in enumerate(row):
-                worksheet.Range[start_row + i, start_col + j].Text = str(val)
+            if row:
+                worksheet.InsertArray([str(val) for val in row], start_row + i, start_col, False)
     except DataError as e:
         logger.error(str(e))
         raise
@@ -1,14 +1,27 @@
+import functools
 import logging
 from typing import Any, Dict
 
 from spire.xls import *
 
-from .workbook import get_or_create_workbook
+from .workbook import get_workbook, get_sheet, save_workbook, workbook_edit
 from .cell_utils import parse_cell_range, validate_cell_reference_regex, EnumMapper
 from .exceptions import ValidationError, FormattingError
 
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=256)
+def _hex_to_color(hex_color: str):
+    """Convert a "#RRGGBB" / "RRGGBB" string to a Spire Color, or None if it isn't 6 digits."""
+    if hex_color.startswith('#'):
+        hex_color = hex_color[1:]
+    if len(hex_color) != 6:
+        return None
+    value = int(hex_color, 16)
+    return Color.FromRgb((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+
+
 def format_range(
     filepath: str,
     sheet_name: str,
@@ -64,139 +77,121 @@ def format_range(
         Dictionary with operation status
     """
     try:
+        with workbook_edit(filepath, ValidationError, FormattingError):
+            wb = get_workbook(filepath)
+
+            sheet = get_sheet(wb, sheet_name)
+            if sheet is None:
+                raise ValidationError(f"Sheet '{sheet_name}' not found")
+
+            # Get the range to format
+            try:
+                range_to_format = sheet.Range[cell_range]
+            except Exception as e:
+                raise ValidationError(f"Invalid cell range '{cell_range}': {e!s}")
+
+            # Nothing requested: skip re-saving the workbook
+            if not any([bold, italic, underline, font_size, font_color, bg_color, border_style, border_color,
+                        number_format, alignment, wrap_text, merge_cells, protection, conditional_format]):
+                return {
+                    "message": "No formatting to apply"
+                }
 
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-        
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-                
-        if sheet is None:
-            raise ValidationError(f"Sheet '{sheet_name}' not found")
-        
-        # Get the range to format
-        range_to_format = sheet.Range[cell_range]
-        
-        # Apply font formatting
-        if any([bold, italic, underline, font_size, font_color]):
-            style = range_to_format.Style
-            if bold:
-                style.Font.IsBold = True
-            if italic:
-                style.Font.IsItalic = True
-            if underline:
-                style.Font.Underline = UnderlineStyle.Continuous
-            if font_size:
-                style.Font.Size = font_size
-            if font_color:
-                # Convert hex color to RGB
-                if font_color.startswith('#'):
-                    font_color = font_color[1:]
-                if len(font_color) == 6:
-                    r = int(font_color[0:2], 16)
-                    g = int(font_color[2:4], 16)
-                    b = int(font_color[4:6], 16)
-                    style.Font.Color = Color.FromRgb(r, g, b)
-        
-        # Apply fill
-        if bg_color:
-            style = range_to_format.Style
-            if bg_color.startswith('#'):
-                bg_color = bg_color[1:]
-            if len(bg_color) == 6:
-                r = int(bg_color[0:2], 16)
-                g = int(bg_color[2:4], 16)
-                b = int(bg_color[4:6], 16)
-                # Set filling pattern type
-                style.Interior.FillPattern = ExcelPatternType.Gradient
-                # Set filling Background color
-                style.Interior.Gradient.BackColor = Color.FromRgb(r, g, b)
-        
-        # Apply borders
-        if border_style or border_color:
-            style = range_to_format.Style
-            border_line_style = EnumMapper.get_border_style_enum(border_style)
-            if border_color:
-                if border_color.startswith('#'):
-                    border_color = border_color[1:]
-                if len(border_color) == 6:
-                    r = int(border_color[0:2], 16)
-                    g = int(border_color[2:4], 16)
-                    b = int(border_color[4:6], 16)
-                    border_color_obj = Color.FromRgb(r, g, b)
-                    style.Borders.Color = border_color_obj
-            style.Borders.LineStyle = border_line_style
-        
-        # Apply number format
-        if number_format:
-            style = range_to_format.Style
-            style.NumberFormat = number_format
-        
-        # Apply alignment
-        if alignment:
-            style = range_to_format.Style
-            style.HorizontalAlignment = EnumMapper.get_alignment_enum(alignment)
-        
-        # Apply text wrapping
-        if wrap_text:
-            style = range_to_format.Style
-            style.WrapText = True
-        
-        # Apply cell merging
-        if merge_cells:
-            range_to_format.Merge()
-        
-        # Apply protection
-        if protection:
             style = range_to_format.Style
-            if 'locked' in protection:
-                style.Locked = protection['locked']
-            if 'hidden' in protection:
-                style.HideFormula = protection['hidden']
-        
-        # Apply conditional formatting
-        if conditional_format:
-            op_str = conditional_format.get("criteria", "greater")
-            operator = EnumMapper.get_operator_enum(op_str)
-            xcf = sheet.ConditionalFormats.Add()
-            xcf.AddRange(range_to_format)
-            fmt = xcf.AddCondition()
-            type = conditional_format.get("type", "cell")
-            fmt.FormatType = EnumMapper.get_condition_enum(type)
-            fmt.Operator = operator
-            fmt.FirstFormula = conditional_format.get("first_formula", str(conditional_format.get("value", "0")))
-            fmt.SecondFormula = conditional_format.get("second_formula", str(conditional_format.get("value2", "0")))
-            if "format" in conditional_format:
-                format = conditional_format["format"]
-                if "font_color" in format:
-                    color = format["font_color"]
-                    if color.startswith("#"):
-                        color = color[1:]
-                    if len(color) == 6:
-                        r = int(color[0:2], 16)
-                        g = int(color[2:4], 16)
-                        b = int(color[4:6], 16)
-                        fmt.FontColor = Color.FromRgb(r, g, b)
-                if "bg_color" in format:
-                    color = format["bg_color"]
-                    if color.startswith("#"):
-                        color = color[1:]
-                    if len(color) == 6:
-                        r = int(color[0:2], 16)
-                        g = int(color[2:4], 16)
-                        b = int(color[4:6], 16)
-                        fmt.BackColor = Color.FromRgb(r, g, b)
-        
-        # Save changes
-        wb.SaveToFile(filepath)
-        
-        return {
-            "message": "Formatting applied successfully"
-        }
-        
+
+            # Apply font formatting
+            if any([bold, italic, underline, font_size, font_color]):
+                if bold:
+                    style.Font.IsBold = True
+                if italic:
+                    style.Font.IsItalic = True
+                if underline:
+                    style.Font.Underline = UnderlineStyle.Continuous
+                if font_size:
+                    style.Font.Size = font_size
+                if font_color:
+                    color = _hex_to_color(font_color)
+                    if color is not None:
+                        style.Font.Color = color
+
+            # Apply fill
+            if bg_color:
+                color = _hex_to_color(bg_color)
+                if color is not None:
+                    # Set filling pattern type
+                    style.Interior.FillPattern = ExcelPatternType.Gradient
+                    # Set filling Background color
+                    style.Interior.Gradient.BackColor = color
+
+            # Apply borders
+            if border_style or border_color:
+                border_line_style = EnumMapper.get_border_style_enum(border_style)
+                if border_color:
+                    color = _hex_to_color(border_color)
+                    if color is not None:
+                        style.Borders.Color = color
+                style.Borders.LineStyle = border_line_style
+
+            # Apply number format
+            if number_format:
+                style.NumberFormat = number_format
+
+            # Apply alignment
+            if alignment:
+                style.HorizontalAlignment = EnumMapper.get_alignment_enum(alignment)
+
+            # Apply text wrapping
+            if wrap_text:
+                style.WrapText = True
+
+            # Apply cell merging
+            if merge_cells:
+                range_to_format.Merge()
+
+            # Apply protection
+            if protection:
+                if 'locked' in protection:
+                    style.Locked = protection['locked']
+                if 'hidden' in protection:
+                    style.HideFormula = protection['hidden']
+
+            # Apply conditional formatting
+            if conditional_format:
+                op_str = conditional_format.get("criteria", "greater")
+                operator = EnumMapper.get_operator_enum(op_str)
+                xcf = sheet.ConditionalFormats.Add()
+                xcf.AddRange(range_to_format)
+                fmt = xcf.AddCondition()
+                type = conditional_format.get("type", "cell")
+                fmt.FormatType = EnumMapper.get_condition_enum(type)
+                fmt.Operator = operator
+                # Only stringify the value fallbacks when no explicit formula is given
+                if "first_formula" in conditional_format:
+                    fmt.FirstFormula = conditional_format["first_formula"]
+                else:
+                    fmt.FirstFormula = str(conditional_format.get("value", "0"))
+                if "second_formula" in conditional_format:
+                    fmt.SecondFormula = conditional_format["second_formula"]
+                else:
+                    fmt.SecondFormula = str(conditional_format.get("value2", "0"))
+                if "format" in conditional_format:
+                    format = conditional_format["format"]
+                    if "font_color" in format:
+                        color = _hex_to_color(format["font_color"])
+                        if color is not None:
+                            fmt.FontColor = color
+                    if "bg_color" in format:
+                        color = _hex_to_color(format["bg_color"])
+                        if color is not None:
+                            fmt.BackColor = color
+
+            # Save changes
+            save_workbook(wb, filepath)
+
+            return {
+                "message": "Formatting applied successfully"
+            }
+
     except (ValidationError, FormattingError) as e:
         logger.error(str(e))
         raise
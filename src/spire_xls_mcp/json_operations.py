@@ -1,12 +1,39 @@
 import json
 import logging
-from typing import Dict, Any
+from itertools import chain
+from typing import Dict, Any, List, Tuple
 
 from spire.xls import *
 from .exceptions import DataError, ValidationError
+from .workbook import (
+    get_workbook,
+    get_sheet,
+    invalidate_sheet_index,
+    save_workbook,
+    workbook_edit,
+    workbook_lock
+)
+
+try:
+    # Optional faster JSON parser/encoder for UTF-8 files
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional streaming parser for large JSON arrays
+    import ijson
+except ImportError:
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
+# JSON files above this size whose top level is an array are streamed with ijson
+_STREAM_THRESHOLD = 16 * 1024 * 1024
+
+_NO_ITEMS = object()
+
+
 def export_to_json(
     filepath: str,
     sheet_name: str,
@@ -27,7 +54,8 @@ def export_to_json(
         options: Additional options such as:
             - pretty_print: Whether to pretty print JSON (default True)
             - date_format: Date format (default ISO format)
-            - encoding: File encoding (default utf-8)
+            - encoding: File encoding (default utf-8); the orjson fast path
+              only applies to compact UTF-8 output
             - array_format: Use array format when include_headers is False (default False)
     
     Returns:
@@ -41,66 +69,61 @@ def export_to_json(
         encoding = options.get("encoding", "utf-8")
         array_format = options.get("array_format", False)
         
-        # Load workbook
-        workbook = Workbook()
-        workbook.LoadFromFile(filepath)
-        
-        # Get worksheet
-        if sheet_name not in [sheet.Name for sheet in workbook.Worksheets]:
-            raise ValidationError(f"Worksheet '{sheet_name}' does not exist")
-        
-        sheet = workbook.Worksheets[sheet_name]
-        
-        # Get range
-        try:
-            range_data = sheet.Range[cell_range]
-        except Exception as e:
-            raise ValidationError(f"Invalid cell range '{cell_range}': {str(e)}")
-        
-        # Get data
-        rows = range_data.LastRow - range_data.Row + 1
-        columns = range_data.LastColumn - range_data.Column + 1
-        data = []
-        
+        with workbook_lock(filepath):
+            # Load workbook (shared cached copy; read-only here)
+            workbook = get_workbook(filepath)
+
+            # Get worksheet
+            sheet = get_sheet(workbook, sheet_name)
+            if sheet is None:
+                raise ValidationError(f"Worksheet '{sheet_name}' does not exist")
+
+            # Get range
+            try:
+                range_data = sheet.Range[cell_range]
+            except Exception as e:
+                raise ValidationError(f"Invalid cell range '{cell_range}': {str(e)}")
+
+            # Get data: read every cell value in one pass over the range's
+            # row-major Cells, then shape rows in pure Python
+            rows = range_data.LastRow - range_data.Row + 1
+            columns = range_data.LastColumn - range_data.Column + 1
+            if rows <= 0 or columns <= 0 or (include_headers and rows == 1):
+                # Empty range, or a header row with no data under it: nothing to read
+                rows, values = 0, []
+            else:
+                values = [cell.Value for cell in range_data.Cells]
+
+        matrix = [values[i * columns:(i + 1) * columns] for i in range(rows)]
+
         if include_headers:
             # Use first row as headers
-            headers = []
-            for j in range(1, columns + 1):
-                cell_value = range_data[1, j].Value
-                headers.append(str(cell_value) if cell_value is not None else f"Column{j}")
-            
+            headers = [
+                str(cell_value) if cell_value is not None else f"Column{j}"
+                for j, cell_value in enumerate(matrix[0] if matrix else [], start=1)
+            ]
+
             # Read data starting from second row (skip header row)
-            for i in range(2, rows + 1):
-                row_data = {}
-                for j in range(1, columns + 1):
-                    cell_value = range_data[i, j].Value
-                    row_data[headers[j - 1]] = cell_value
-                data.append(row_data)
+            data = [dict(zip(headers, row)) for row in matrix[1:]]
         else:
             # All rows as data
             if array_format:
                 # Simple 2D array
-                for i in range(1, rows + 1):
-                    row_data = []
-                    for j in range(1, columns + 1):
-                        cell_value = range_data[i, j].Value
-                        row_data.append(cell_value)
-                    data.append(row_data)
+                data = matrix
             else:
                 # Use position index as keys
-                for i in range(1, rows + 1):
-                    row_data = {}
-                    for j in range(1, columns + 1):
-                        cell_value = range_data[i, j].Value
-                        row_data[f"Column{j}"] = cell_value
-                    data.append(row_data)
+                keys = [f"Column{j}" for j in range(1, columns + 1)]
+                data = [dict(zip(keys, row)) for row in matrix]
         
-        # Write to JSON file
-        with open(output_filepath, 'w', encoding=encoding) as f:
+        # Write to JSON file, encoding the whole document before a single write.
+        # Buffered f.write (not a bare os.write) retries short writes on large output.
+        if orjson is not None and not pretty_print and _is_utf8(encoding):
+            with open(output_filepath, 'wb') as f:
+                f.write(orjson.dumps(data, default=str))
+        else:
             indent = 4 if pretty_print else None
-            json.dump(data, f, indent=indent, ensure_ascii=False, default=str)
-        
-        workbook.Dispose()
+            with open(output_filepath, 'w', encoding=encoding) as f:
+                f.write(json.dumps(data, indent=indent, ensure_ascii=False, default=str))
         
         return {"message": f"Excel data successfully exported to JSON file: {output_filepath}"}
     
@@ -141,92 +164,166 @@ def import_from_json(
         encoding = options.get("encoding", "utf-8")
         include_headers = options.get("include_headers", True)
         
-        # Read JSON file
-        with open(json_filepath, 'r', encoding=encoding) as f:
-            json_data = json.load(f)
-        
-        if not json_data:
-            raise DataError("No data found in JSON file")
-        
-        # Load workbook
-        workbook = Workbook()
-        if os.path.exists(excel_filepath):
-            workbook.LoadFromFile(excel_filepath)
-        
-        # Get or create worksheet
-        if sheet_name not in [sheet.Name for sheet in workbook.Worksheets]:
-            if create_sheet:
-                sheet = workbook.Worksheets.Add(sheet_name)
-            else:
-                raise ValidationError(f"Worksheet '{sheet_name}' does not exist, and create flag not set")
-        else:
-            sheet = workbook.Worksheets[sheet_name]
-        
-        # Parse starting cell
-        try:
-            start_range = sheet.Range[start_cell]
-            start_row = start_range.Row
-            start_col = start_range.Column
-        except Exception as e:
-            raise ValidationError(f"Invalid start cell '{start_cell}': {str(e)}")
-        
-        # Write data to Excel
-        current_row = start_row
+        # Read JSON file and flatten it into rows; header rows are written as text
+        rows, header_rows = _read_json_rows(json_filepath, encoding, include_headers)
         
-        # Check JSON data type
-        if isinstance(json_data, list):
-            if json_data and isinstance(json_data[0], dict):
-                # Array of objects
-                if include_headers:
-                    # Write header row
-                    headers = list(json_data[0].keys())
-                    for col_idx, header in enumerate(headers):
-                        sheet.Range[current_row, start_col + col_idx].Text = header
-                    current_row += 1
-                
-                # Write data rows
-                for row_data in json_data:
-                    if isinstance(row_data, dict):
-                        if include_headers:
-                            # Use headers as keys
-                            headers = list(json_data[0].keys())
-                            for col_idx, header in enumerate(headers):
-                                value = row_data.get(header)
-                                sheet.Range[current_row, start_col + col_idx].Value = str(value)
-                        else:
-                            # Write values in order
-                            for col_idx, (_, value) in enumerate(row_data.items()):
-                                sheet.Range[current_row, start_col + col_idx].Value = str(value)
-                        current_row += 1
-            elif json_data and isinstance(json_data[0], list):
-                # 2D array
-                for row_data in json_data:
-                    if isinstance(row_data, list):
-                        for col_idx, value in enumerate(row_data):
-                            sheet.Range[current_row, start_col + col_idx].Value = str(value)
-                        current_row += 1
+        # A failure below may leave a partially imported sheet in the cached workbook
+        with workbook_edit(excel_filepath):
+            # Load workbook: the cached copy if the file exists, else a new one
+            if os.path.exists(excel_filepath):
+                workbook = get_workbook(excel_filepath)
             else:
-                # Simple array
-                for row_idx, value in enumerate(json_data):
-                    sheet.Range[current_row + row_idx, start_col].Value = str(value)
-        else:
-            # Single object
-            if include_headers:
-                # Write keys as headers, values as data
-                for col_idx, (key, value) in enumerate(json_data.items()):
-                    sheet.Range[current_row, start_col + col_idx].Text = str(key)
-                    sheet.Range[current_row + 1, start_col + col_idx].Value = str(value)
-            else:
-                # Write values only
-                for col_idx, (_, value) in enumerate(json_data.items()):
-                    sheet.Range[current_row, start_col + col_idx].Value = str(value)
-        
-        # Save workbook
-        workbook.SaveToFile(excel_filepath)
-        workbook.Dispose()
-        
+                workbook = Workbook()
+
+            # Get or create worksheet
+            sheet = get_sheet(workbook, sheet_name)
+            if sheet is None:
+                if create_sheet:
+                    sheet = workbook.Worksheets.Add(sheet_name)
+                    invalidate_sheet_index(workbook)
+                else:
+                    raise ValidationError(f"Worksheet '{sheet_name}' does not exist, and create flag not set")
+
+            # Parse starting cell
+            try:
+                start_range = sheet.Range[start_cell]
+                start_row = start_range.Row
+                start_col = start_range.Column
+            except Exception as e:
+                raise ValidationError(f"Invalid start cell '{start_cell}': {str(e)}")
+
+            # Write data to Excel with calculation switched to manual, so
+            # formulas over the target range aren't recomputed per write
+            calculation_mode = workbook.CalculationMode
+            workbook.CalculationMode = ExcelCalculationMode.Manual
+            try:
+                _write_rows(sheet, start_row, start_col, rows, header_rows)
+            finally:
+                workbook.CalculationMode = calculation_mode
+
+            # Save workbook
+            save_workbook(workbook, excel_filepath)
+
         return {"message": f"JSON data successfully imported to Excel file: {excel_filepath}"}
     
     except Exception as e:
         logger.error(f"Failed to import JSON: {str(e)}")
-        raise DataError(f"Failed to import JSON: {str(e)}") 
\ No newline at end of file
+        raise DataError(f"Failed to import JSON: {str(e)}") 
+
+
+def _is_utf8(encoding: str) -> bool:
+    return encoding.replace("-", "").replace("_", "").lower() == "utf8"
+
+
+def _first_json_byte(f) -> bytes:
+    """Return the first non-whitespace byte of a binary file and rewind it."""
+    while True:
+        chunk = f.read(4096)
+        stripped = chunk.lstrip()
+        if stripped or not chunk:
+            f.seek(0)
+            return stripped[:1]
+
+
+def _read_json_rows(json_filepath: str, encoding: str, include_headers: bool) -> Tuple[List[List[Any]], int]:
+    """Parse a JSON file and flatten it into rows of cell values.
+
+    Large top-level arrays are streamed item by item with ijson when it is
+    installed, so the parsed list never sits in memory next to the rows.
+    Otherwise the file is parsed with orjson when available, else json.
+    """
+    if ijson is not None and _is_utf8(encoding) and os.path.getsize(json_filepath) > _STREAM_THRESHOLD:
+        with open(json_filepath, 'rb') as f:
+            if _first_json_byte(f) == b'[':
+                rows, header_rows = _json_to_rows(ijson.items(f, 'item', use_float=True), include_headers)
+                if not rows:
+                    raise DataError("No data found in JSON file")
+                return rows, header_rows
+
+    if orjson is not None and _is_utf8(encoding):
+        with open(json_filepath, 'rb') as f:
+            json_data = orjson.loads(f.read())
+    else:
+        with open(json_filepath, 'r', encoding=encoding) as f:
+            json_data = json.load(f)
+
+    if not json_data:
+        raise DataError("No data found in JSON file")
+    return _json_to_rows(json_data, include_headers)
+
+
+def _coerce(value: Any) -> Any:
+    """Keep JSON numbers, booleans and strings native; stringify anything else."""
+    if isinstance(value, (str, int, float)):  # bool is an int subclass
+        return value
+    return str(value)
+
+
+def _json_to_rows(json_data: Any, include_headers: bool) -> Tuple[List[List[Any]], int]:
+    """Flatten JSON data into rows of cell values.
+
+    json_data is a parsed object or array, or an iterator over array items.
+    Returns the rows and how many leading rows are headers.
+    """
+    if not isinstance(json_data, dict):
+        items = iter(json_data)
+        first = next(items, _NO_ITEMS)
+        if first is _NO_ITEMS:
+            return [], 0
+        items = chain((first,), items)
+
+        if isinstance(first, dict):
+            # Array of objects
+            if include_headers:
+                headers = list(first.keys())
+                rows = [headers]
+                rows.extend(
+                    [_coerce(row_data.get(header)) for header in headers]
+                    for row_data in items if isinstance(row_data, dict)
+                )
+                return rows, 1
+            return [
+                [_coerce(value) for value in row_data.values()]
+                for row_data in items if isinstance(row_data, dict)
+            ], 0
+        if isinstance(first, list):
+            # 2D array
+            return [
+                [_coerce(value) for value in row_data]
+                for row_data in items if isinstance(row_data, list)
+            ], 0
+        # Simple array
+        return [[_coerce(value)] for value in items], 0
+
+    # Single object
+    if include_headers:
+        # Keys as headers, values as data
+        return [[str(key) for key in json_data], [_coerce(value) for value in json_data.values()]], 1
+    return [[_coerce(value) for value in json_data.values()]], 0
+
+
+def _write_rows(sheet, start_row: int, start_col: int, rows: List[List[Any]], header_rows: int = 0) -> None:
+    """Write rows of cell values through one block fetch of the target range.
+
+    Header rows are set as text. Numbers and booleans are stored natively;
+    strings go through Value, so numeric strings still parse as numbers.
+    """
+    width = max((len(row) for row in rows), default=0)
+    if not width:
+        return
+    # Cells is row-major, so row i starts at i * width; short rows leave padding untouched
+    cells = sheet.Range[start_row, start_col, start_row + len(rows) - 1, start_col + width - 1].Cells
+    for i, row in enumerate(rows):
+        base = i * width
+        if i < header_rows:
+            for j, value in enumerate(row):
+                cells[base + j].Text = value
+        else:
+            for j, value in enumerate(row):
+                cell = cells[base + j]
+                if isinstance(value, bool):
+                    cell.BooleanValue = value
+                elif isinstance(value, (int, float)):
+                    cell.NumberValue = value
+                else:
+                    cell.Value = value
@@ -3,9 +3,9 @@ import logging
 
 from spire.xls import *
 
-from .cell_utils import EnumMapper
+from .cell_utils import EnumMapper, _normalize_enum_key
 from .exceptions import ValidationError, PivotError
-from .workbook import get_or_create_workbook
+from .workbook import get_or_create_workbook, get_or_create_sheet, save_workbook, workbook_edit
 
 logger = logging.getLogger(__name__)
 
@@ -23,42 +23,38 @@ def create_pivot_table(
 ) -> dict[str, Any]:
     """Create pivot table in worksheet."""
     try:
-        wb = get_or_create_workbook(filepath)
-        sheet = None
+        # Validate the aggregation function before touching the workbook
+        agg_key = _normalize_enum_key(agg_func)
+        if agg_key not in EnumMapper.SUBTOTAL_MAP:
+            raise PivotError(f"Unsupported aggregation function: {agg_func}")
+        subtotal = EnumMapper.SUBTOTAL_MAP[agg_key]
 
-        # Find or create sheet
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-        if sheet is None:
-            sheet = wb.CreateEmptySheet(sheet_name)
+        with workbook_edit(filepath, ValidationError, PivotError):
+            wb = get_or_create_workbook(filepath)
+            sheet = get_or_create_sheet(wb, sheet_name)
 
-        cache = wb.PivotCaches.Add(sheet.Range[data_range])
-        # Create pivot table
-        pivot_table = sheet.PivotTables.Add(pivot_name, sheet.Range[locate_range], cache)
+            cache = wb.PivotCaches.Add(sheet.Range[data_range])
+            # Create pivot table
+            pivot_table = sheet.PivotTables.Add(pivot_name, sheet.Range[locate_range], cache)
+            pivot_fields = pivot_table.PivotFields
 
-        # Set aggregation function
-        if agg_func.lower() not in EnumMapper.SUBTOTAL_MAP:
-            raise PivotError(f"Unsupported aggregation function: {agg_func}")
+            # Add row fields
+            for row in rows:
+                pivot_fields[row].Axis = AxisTypes.Row
 
-        # Add row fields
-        for row in rows:
-            pivot_table.PivotFields[row].Axis = AxisTypes.Row
+            # Add column fields
+            if columns:
+                for col in columns:
+                    pivot_fields[col].Axis = AxisTypes.Column
 
-        # Add column fields
-        if columns:
-            for col in columns:
-                pivot_table.PivotFields[col].Axis = AxisTypes.Column
+            # Add value fields
+            data_fields = pivot_table.DataFields
+            for value, name in values.items():
+                # Drag the field to the data area.
+                data_fields.Add(pivot_fields[value], name, subtotal)
 
-        # Add value fields
-        for value, name in values.items():
-            field = pivot_table.PivotFields[value]
-            subtotal = EnumMapper.get_subtotal_enum(agg_func.lower())
-            # Drag the field to the data area.
-            pivot_table.DataFields.Add(field, name, subtotal)
-            # Save workbook
-            wb.SaveToFile(filepath)
+            # Save workbook once all value fields are added
+            save_workbook(wb, filepath)
 
             return {
                 "message": "Pivot table created successfully",
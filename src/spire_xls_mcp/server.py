@@ -1,6 +1,13 @@
+import asyncio
+import atexit
+import functools
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, List, Dict, Optional
 
 from mcp.server.fastmcp import FastMCP
@@ -22,9 +29,23 @@ from .exceptions import (
 from .validation import (
     validate_range_in_sheet_operation as validate_range_impl
 )
+from .calculations import (
+    apply_formula as apply_formula_impl,
+    apply_formulas as apply_formulas_impl
+)
 from .chart import create_chart_in_sheet as create_chart_impl
-from .workbook import get_workbook_info
-from .data import write_data
+from .workbook import (
+    get_workbook_info,
+    create_workbook as create_workbook_impl,
+    create_sheet as create_worksheet_impl,
+    flush_workbook as flush_workbook_impl,
+    flush_all_workbooks,
+    begin_batch as begin_batch_impl,
+    commit_batch as commit_batch_impl,
+    abort_batch as abort_batch_impl
+)
+from .data import write_data, read_excel_range
+from .formatting import format_range as format_range_func
 from .pivot import create_pivot_table as create_pivot_table_impl
 from .sheet import (
     copy_sheet,
@@ -32,26 +53,60 @@ from .sheet import (
     rename_sheet,
     merge_range,
     unmerge_range,
-    apply_autofilter as apply_autofilter_impl
+    apply_autofilter as apply_autofilter_impl,
+    copy_range_operation,
+    delete_range as delete_range_operation,
+    get_shape_image_base64 as get_shape_img_b64
 )
 from .conversion import convert_workbook as convert_workbook_impl
+from .json_operations import (
+    export_to_json as export_json_impl,
+    import_from_json as import_json_impl
+)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue records as they are; the listener's handlers format them."""
+
+    def prepare(self, record):
+        return record
+
 
-# Configure logging
+# Configure logging. Records are queued unformatted, then formatted and written
+# to stdout and the log file by a listener thread, off the event loop.
+_log_queue = queue.SimpleQueue()
+_log_handlers = [logging.StreamHandler(sys.stdout), logging.FileHandler("spire-xls-mcp.log")]
+for _handler in _log_handlers:
+    _handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler("spire-xls-mcp.log")
-    ],
+    handlers=[_DeferredQueueHandler(_log_queue)],
     force=True
 )
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+# Registered after the listener so it runs first: save changes still held only
+# in memory (flush=False edits, open batches) before the process exits
+atexit.register(flush_all_workbooks, close_batches=True)
 
 logger = logging.getLogger("spire-xls-mcp")
 
 # Get Excel files path from environment or use default
 EXCEL_FILES_PATH = os.environ.get("EXCEL_FILES_PATH", "./excel_files")
 
+# Absolute form of EXCEL_FILES_PATH that relative file names are joined onto
+_EXCEL_FILES_DIR = os.path.abspath(EXCEL_FILES_PATH)
+
+# Transport: "sse" (default) or "streamable-http"
+MCP_TRANSPORT = os.environ.get("MCP_TRANSPORT", "sse").lower()
+
+# Worker threads for blocking Spire calls; installed as the loop's default executor
+_EXECUTOR = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="spire-xls")
+
+# Connections served at once on the streamable HTTP transport before Uvicorn answers 503
+_HTTP_CONCURRENCY_LIMIT = 256
+
 # # Create the directory if it doesn't exist
 # os.makedirs(EXCEL_FILES_PATH, exist_ok=True)
 
@@ -71,8 +126,33 @@ mcp = FastMCP(
 )
 
 
+def excel_tool(*expected: type[Exception], action: str):
+    """Wrap an async tool with the shared error handling.
+
+    Expected errors are returned to the client as "Error: ..." strings; anything
+    else is logged as "Error <action>: ..." and re-raised.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except expected as e:
+                return f"Error: {str(e)}"
+            except Exception as e:
+                logger.error("Error %s: %s", action, e)
+                raise
+
+        return wrapper
+
+    return decorator
+
+
+@functools.lru_cache(maxsize=512)
 def get_excel_path(filename: str) -> str:
     """Get full path to Excel file.
+
+    Results are cached; EXCEL_FILES_PATH is read and made absolute once at startup.
     
     Args:
         filename: Name of Excel file
@@ -85,15 +165,18 @@ def get_excel_path(filename: str) -> str:
         return filename
 
     # Use the configured Excel files path
-    return os.path.join(EXCEL_FILES_PATH, filename)
+    return os.path.join(_EXCEL_FILES_DIR, filename)
 
 
 @mcp.tool()
-def apply_formula(
+@excel_tool(ValidationError, CalculationError, action="applying formula")
+async def apply_formula(
         filepath: str,
         sheet_name: str,
         cell: str,
         formula: str,
+        flush: bool = True,
+        evaluate: bool = True,
 ) -> str:
     """
     Applies an Excel formula to a specified cell with verification.
@@ -103,25 +186,119 @@ def apply_formula(
         sheet_name (str): Name of the worksheet
         cell (str): Cell reference where formula will be applied (e.g., "A1")
         formula (str): Excel formula to apply (must include "=" prefix)
+        flush (bool, optional): Whether to save the workbook immediately (default True).
+            Pass False when applying many formulas and call flush_workbook once at the end;
+            the formulas are then calculated together when the workbook is flushed.
+        evaluate (bool, optional): Whether to calculate the formula (default True).
+            Pass False to only store the formula and leave calculation to Excel.
 
     Returns:
         str: Success message confirming formula application
     """
-    try:
-        full_path = get_excel_path(filepath)
+    full_path = get_excel_path(filepath)
 
-        from .calculations import apply_formula as apply_formula_impl
-        result = apply_formula_impl(full_path, sheet_name, cell, formula)
-        return result["message"]
-    except (ValidationError, CalculationError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error applying formula: {e}")
-        raise
+    result = await asyncio.to_thread(apply_formula_impl, full_path, sheet_name, cell, formula,
+                                     flush=flush, evaluate=evaluate)
+    return result["message"]
 
 
 @mcp.tool()
-def format_range(
+@excel_tool(ValidationError, CalculationError, action="applying formulas")
+async def apply_formulas(
+        filepath: str,
+        sheet_name: str,
+        formulas: Dict[str, str],
+) -> str:
+    """
+    Applies several Excel formulas to a worksheet, saving the workbook once.
+
+    Parameters:
+        filepath (str): Path to the Excel file
+        sheet_name (str): Name of the worksheet
+        formulas (dict): Mapping of cell reference to formula (e.g., {"C1": "=A1+B1", "C2": "=A2+B2"})
+
+    Returns:
+        str: Success message confirming how many formulas were applied
+    """
+    full_path = get_excel_path(filepath)
+
+    result = await asyncio.to_thread(apply_formulas_impl, full_path, sheet_name, formulas)
+    return result["message"]
+
+
+@mcp.tool()
+@excel_tool(WorkbookError, action="flushing workbook")
+async def flush_workbook(filepath: str) -> str:
+    """
+    Saves pending in-memory changes of a workbook to disk.
+
+    Parameters:
+        filepath (str): Path to the Excel file
+
+    Returns:
+        str: Message indicating whether the workbook was saved
+    """
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(flush_workbook_impl, full_path)
+    return result["message"]
+
+
+@mcp.tool()
+@excel_tool(WorkbookError, action="beginning batch")
+async def begin_batch(filepath: str) -> str:
+    """
+    Starts a batch for a workbook: later edits to it are kept in memory instead of
+    being saved one by one, until commit_batch or abort_batch is called.
+
+    Parameters:
+        filepath (str): Path to the Excel file
+
+    Returns:
+        str: Message confirming the batch was started
+    """
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(begin_batch_impl, full_path)
+    return result["message"]
+
+
+@mcp.tool()
+@excel_tool(WorkbookError, action="committing batch")
+async def commit_batch(filepath: str, recalculate: bool = False) -> str:
+    """
+    Ends the batch started by begin_batch and saves the workbook once.
+
+    Parameters:
+        filepath (str): Path to the Excel file
+        recalculate (bool, optional): Calculate every formula in the workbook before saving. Defaults to False.
+
+    Returns:
+        str: Message indicating whether the workbook was saved
+    """
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(commit_batch_impl, full_path, recalculate)
+    return result["message"]
+
+
+@mcp.tool()
+@excel_tool(WorkbookError, action="aborting batch")
+async def abort_batch(filepath: str) -> str:
+    """
+    Ends the batch started by begin_batch without saving, discarding its changes.
+
+    Parameters:
+        filepath (str): Path to the Excel file
+
+    Returns:
+        str: Message confirming the batch was aborted
+    """
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(abort_batch_impl, full_path)
+    return result["message"]
+
+
+@mcp.tool()
+@excel_tool(ValidationError, FormattingError, action="formatting range")
+async def format_range(
         filepath: str,
         sheet_name: str,
         cell_range: str,
@@ -165,43 +342,39 @@ def format_range(
     Returns:
         str: Success message confirming formatting was applied
     """
-    try:
-        full_path = get_excel_path(filepath)
-        from .formatting import format_range as format_range_func
-
-        result = format_range_func(
-            filepath=full_path,
-            sheet_name=sheet_name,
-            cell_range=cell_range,
-            bold=bold,
-            italic=italic,
-            underline=underline,
-            font_size=font_size,
-            font_color=font_color,
-            bg_color=bg_color,
-            border_style=border_style,
-            border_color=border_color,
-            number_format=number_format,
-            alignment=alignment,
-            wrap_text=wrap_text,
-            merge_cells=merge_cells,
-            protection=protection,
-            conditional_format=conditional_format
-        )
-        return "Range formatted successfully"
-    except (ValidationError, FormattingError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error formatting range: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+
+    result = await asyncio.to_thread(
+        format_range_func,
+        filepath=full_path,
+        sheet_name=sheet_name,
+        cell_range=cell_range,
+        bold=bold,
+        italic=italic,
+        underline=underline,
+        font_size=font_size,
+        font_color=font_color,
+        bg_color=bg_color,
+        border_style=border_style,
+        border_color=border_color,
+        number_format=number_format,
+        alignment=alignment,
+        wrap_text=wrap_text,
+        merge_cells=merge_cells,
+        protection=protection,
+        conditional_format=conditional_format
+    )
+    return "Range formatted successfully"
 
 
 @mcp.tool()
-def read_data_from_excel(
+@excel_tool(action="reading data")
+async def read_data_from_excel(
         filepath: str,
         sheet_name: str,
         cell_range: str,
-        preview_only: bool = False
+        preview_only: bool = False,
+        columnar: bool = False
 ) -> str:
     """
     Reads data from an Excel worksheet.
@@ -214,24 +387,23 @@ def read_data_from_excel(
         sheet_name (str): Name of the worksheet to read from
         cell_range (str): Range of cells to read (e.g., "A1:D10")
         preview_only (bool, optional): If True, returns only preview data without full styling info
+        columnar (bool, optional): If True, returns a compact payload with "values", "formulas"
+            and run-length encoded "styles" lists per column instead of one dict per cell
 
     Returns:
         dict: Column-first nested dictionary with cell data
     """
-    try:
-        full_path = get_excel_path(filepath)
-        from .data import read_excel_range
-        result = read_excel_range(full_path, sheet_name, cell_range, preview_only)
-        if not result:
-            return "No data found in specified range"
-        return result
-    except Exception as e:
-        logger.error(f"Error reading data: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(read_excel_range, full_path, sheet_name, cell_range,
+                                     preview_only, columnar)
+    if not result:
+        return "No data found in specified range"
+    return result
 
 
 @mcp.tool()
-def write_data_to_excel(
+@excel_tool(ValidationError, DataError, action="writing data")
+async def write_data_to_excel(
         filepath: str,
         sheet_name: str,
         data: List[List],
@@ -249,19 +421,14 @@ def write_data_to_excel(
     Returns:
         str: Success message confirming data was written
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = write_data(full_path, sheet_name, data, start_cell)
-        return result["message"]
-    except (ValidationError, DataError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error writing data: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(write_data, full_path, sheet_name, data, start_cell)
+    return result["message"]
 
 
 @mcp.tool()
-def create_workbook(filepath: str, sheet_name: str = None) -> str:
+@excel_tool(WorkbookError, action="creating workbook")
+async def create_workbook(filepath: str, sheet_name: str = None) -> str:
     """
     Creates a new Excel workbook.
 
@@ -272,20 +439,14 @@ def create_workbook(filepath: str, sheet_name: str = None) -> str:
     Returns:
         str: Success message with the created workbook path
     """
-    try:
-        full_path = get_excel_path(filepath)
-        from .workbook import create_workbook as create_workbook_impl
-        result = create_workbook_impl(full_path, sheet_name)
-        return f"Created workbook at {full_path}"
-    except WorkbookError as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error creating workbook: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(create_workbook_impl, full_path, sheet_name)
+    return f"Created workbook at {full_path}"
 
 
 @mcp.tool()
-def create_worksheet(filepath: str, sheet_name: str) -> str:
+@excel_tool(ValidationError, WorkbookError, action="creating worksheet")
+async def create_worksheet(filepath: str, sheet_name: str) -> str:
     """
     Creates a new worksheet in an existing workbook.
 
@@ -296,20 +457,14 @@ def create_worksheet(filepath: str, sheet_name: str) -> str:
     Returns:
         str: Success message confirming sheet creation
     """
-    try:
-        full_path = get_excel_path(filepath)
-        from .workbook import create_sheet as create_worksheet_impl
-        result = create_worksheet_impl(full_path, sheet_name)
-        return result["message"]
-    except (ValidationError, WorkbookError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error creating worksheet: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(create_worksheet_impl, full_path, sheet_name)
+    return result["message"]
 
 
 @mcp.tool()
-def create_chart(
+@excel_tool(ValidationError, ChartError, action="creating chart")
+async def create_chart(
         filepath: str,
         sheet_name: str,
         data_range: str,
@@ -345,29 +500,25 @@ def create_chart(
     Raises:
         ChartError: If chart creation fails or parameters are invalid.
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = create_chart_impl(
-            filepath=full_path,
-            sheet_name=sheet_name,
-            data_range=data_range,
-            chart_type=chart_type,
-            target_cell=target_cell,
-            title=title,
-            x_axis=x_axis,
-            y_axis=y_axis,
-            style=style
-        )
-        return result["message"]
-    except (ValidationError, ChartError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error creating chart: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(
+        create_chart_impl,
+        filepath=full_path,
+        sheet_name=sheet_name,
+        data_range=data_range,
+        chart_type=chart_type,
+        target_cell=target_cell,
+        title=title,
+        x_axis=x_axis,
+        y_axis=y_axis,
+        style=style
+    )
+    return result["message"]
 
 
 @mcp.tool()
-def create_pivot_table(
+@excel_tool(ValidationError, PivotError, action="creating pivot table")
+async def create_pivot_table(
         filepath: str,
         sheet_name: str,
         pivot_name: str,
@@ -397,29 +548,25 @@ def create_pivot_table(
     Returns:
         str: Success message confirming pivot table creation
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = create_pivot_table_impl(
-            filepath=full_path,
-            sheet_name=sheet_name,
-            pivot_name=pivot_name,
-            data_range=data_range,
-            locate_range=locate_range,
-            rows=rows,
-            values=values,
-            columns=columns or [],
-            agg_func=agg_func
-        )
-        return result["message"]
-    except (ValidationError, PivotError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error creating pivot table: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(
+        create_pivot_table_impl,
+        filepath=full_path,
+        sheet_name=sheet_name,
+        pivot_name=pivot_name,
+        data_range=data_range,
+        locate_range=locate_range,
+        rows=rows,
+        values=values,
+        columns=columns or [],
+        agg_func=agg_func
+    )
+    return result["message"]
 
 
 @mcp.tool()
-def copy_worksheet(
+@excel_tool(ValidationError, SheetError, action="copying worksheet")
+async def copy_worksheet(
         filepath: str,
         source_sheet: str,
         target_sheet: str
@@ -435,19 +582,14 @@ def copy_worksheet(
     Returns:
         str: Success message confirming sheet was copied
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = copy_sheet(full_path, source_sheet, target_sheet)
-        return result["message"]
-    except (ValidationError, SheetError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error copying worksheet: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(copy_sheet, full_path, source_sheet, target_sheet)
+    return result["message"]
 
 
 @mcp.tool()
-def delete_worksheet(
+@excel_tool(ValidationError, SheetError, action="deleting worksheet")
+async def delete_worksheet(
         filepath: str,
         sheet_name: str
 ) -> str:
@@ -461,19 +603,14 @@ def delete_worksheet(
     Returns:
         str: Success message confirming worksheet deletion
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = delete_sheet(full_path, sheet_name)
-        return result["message"]
-    except (ValidationError, SheetError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error deleting worksheet: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(delete_sheet, full_path, sheet_name)
+    return result["message"]
 
 
 @mcp.tool()
-def rename_worksheet(
+@excel_tool(ValidationError, SheetError, action="renaming worksheet")
+async def rename_worksheet(
         filepath: str,
         old_name: str,
         new_name: str
@@ -489,19 +626,14 @@ def rename_worksheet(
     Returns:
         str: Success message confirming the rename operation
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = rename_sheet(full_path, old_name, new_name)
-        return result["message"]
-    except (ValidationError, SheetError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error renaming worksheet: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(rename_sheet, full_path, old_name, new_name)
+    return result["message"]
 
 
 @mcp.tool()
-def get_workbook_metadata(
+@excel_tool(WorkbookError, action="getting workbook metadata")
+async def get_workbook_metadata(
         filepath: str,
         include_ranges: bool = False
 ) -> str:
@@ -520,19 +652,14 @@ def get_workbook_metadata(
             - modified: Last modification timestamp
             - used_ranges: Dictionary mapping sheet names to their used data ranges (if include_ranges=True)
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = get_workbook_info(full_path, include_ranges=include_ranges)
-        return str(result)
-    except WorkbookError as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error getting workbook metadata: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(get_workbook_info, full_path, include_ranges=include_ranges)
+    return json.dumps(result, separators=(",", ":"))
 
 
 @mcp.tool()
-def merge_cells(filepath: str,
+@excel_tool(ValidationError, SheetError, action="merging cells")
+async def merge_cells(filepath: str,
                 sheet_name: str,
                 cell_range_list: List[str]) -> str:
     """
@@ -546,19 +673,14 @@ def merge_cells(filepath: str,
     Returns:
         str: Success message confirming cells were merged
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = merge_range(full_path, sheet_name, cell_range_list)
-        return result["message"]
-    except (ValidationError, SheetError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error merging cells: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(merge_range, full_path, sheet_name, cell_range_list)
+    return result["message"]
 
 
 @mcp.tool()
-def unmerge_cells(filepath: str, sheet_name: str, cell_range: str) -> str:
+@excel_tool(ValidationError, SheetError, action="unmerging cells")
+async def unmerge_cells(filepath: str, sheet_name: str, cell_range: str) -> str:
     """
     Unmerges a range of previously merged cells.
 
@@ -570,19 +692,14 @@ def unmerge_cells(filepath: str, sheet_name: str, cell_range: str) -> str:
     Returns:
         str: Success message confirming cells were unmerged
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = unmerge_range(full_path, sheet_name, cell_range)
-        return result["message"]
-    except (ValidationError, SheetError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error unmerging cells: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(unmerge_range, full_path, sheet_name, cell_range)
+    return result["message"]
 
 
 @mcp.tool()
-def copy_range(
+@excel_tool(ValidationError, SheetError, action="copying range")
+async def copy_range(
         filepath: str,
         sheet_name: str,
         source_range: str,
@@ -602,26 +719,21 @@ def copy_range(
     Returns:
         str: Success message confirming range was copied
     """
-    try:
-        full_path = get_excel_path(filepath)
-        from .sheet import copy_range_operation
-        result = copy_range_operation(
-            full_path,
-            sheet_name,
-            source_range,
-            target_range,
-            target_sheet
-        )
-        return result["message"]
-    except (ValidationError, SheetError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error copying range: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(
+        copy_range_operation,
+        full_path,
+        sheet_name,
+        source_range,
+        target_range,
+        target_sheet
+    )
+    return result["message"]
 
 
 @mcp.tool()
-def delete_range(
+@excel_tool(ValidationError, SheetError, action="deleting range")
+async def delete_range(
         filepath: str,
         sheet_name: str,
         cell_range: str,
@@ -639,25 +751,20 @@ def delete_range(
     Returns:
         str: Success message describing the deletion and shift operation
     """
-    try:
-        full_path = get_excel_path(filepath)
-        from .sheet import delete_range as delete_range_operation
-        result = delete_range_operation(
-            full_path,
-            sheet_name,
-            cell_range,
-            shift_direction
-        )
-        return result["message"]
-    except (ValidationError, SheetError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error deleting range: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(
+        delete_range_operation,
+        full_path,
+        sheet_name,
+        cell_range,
+        shift_direction
+    )
+    return result["message"]
 
 
 @mcp.tool()
-def apply_autofilter(
+@excel_tool(ValidationError, SheetError, action="applying autofilter")
+async def apply_autofilter(
         filepath: str,
         sheet_name: str,
         cell_range: str,
@@ -684,24 +791,20 @@ def apply_autofilter(
     Returns:
         str: Success or error message
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = apply_autofilter_impl(
-            full_path,
-            sheet_name,
-            cell_range,
-            filter_criteria
-        )
-        return result["message"]
-    except (ValidationError, SheetError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error applying autofilter: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(
+        apply_autofilter_impl,
+        full_path,
+        sheet_name,
+        cell_range,
+        filter_criteria
+    )
+    return result["message"]
 
 
 @mcp.tool()
-def validate_excel_range(
+@excel_tool(ValidationError, action="validating range")
+async def validate_excel_range(
         filepath: str,
         sheet_name: str,
         cell_range: str
@@ -717,19 +820,14 @@ def validate_excel_range(
     Returns:
         str: Validation result including details about the actual data range in the sheet
     """
-    try:
-        full_path = get_excel_path(filepath)
-        result = validate_range_impl(full_path, sheet_name, cell_range)
-        return result["message"]
-    except ValidationError as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error validating range: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    result = await asyncio.to_thread(validate_range_impl, full_path, sheet_name, cell_range)
+    return result["message"]
 
 
 @mcp.tool()
-def export_to_json(
+@excel_tool(ValidationError, DataError, action="exporting to JSON")
+async def export_to_json(
         filepath: str,
         sheet_name: str,
         cell_range: str,
@@ -755,29 +853,24 @@ def export_to_json(
     Returns:
         str: Success message with the path to the created JSON file
     """
-    try:
-        full_path = get_excel_path(filepath)
-        output_path = get_excel_path(output_filepath)
-        
-        from .json_operations import export_to_json as export_json_impl
-        result = export_json_impl(
-            full_path,
-            sheet_name,
-            cell_range,
-            output_path,
-            include_headers,
-            options
-        )
-        return result["message"]
-    except (ValidationError, DataError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error exporting to JSON: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    output_path = get_excel_path(output_filepath)
+    
+    result = await asyncio.to_thread(
+        export_json_impl,
+        full_path,
+        sheet_name,
+        cell_range,
+        output_path,
+        include_headers,
+        options
+    )
+    return result["message"]
 
 
 @mcp.tool()
-def import_from_json(
+@excel_tool(ValidationError, DataError, action="importing from JSON")
+async def import_from_json(
         json_filepath: str,
         excel_filepath: str,
         sheet_name: str,
@@ -802,29 +895,23 @@ def import_from_json(
     Returns:
         str: Success message with the path to the updated Excel file
     """
-    try:
-        json_path = get_excel_path(json_filepath)
-        excel_path = get_excel_path(excel_filepath)
-        
-        from .json_operations import import_from_json as import_json_impl
-        result = import_json_impl(
-            json_path,
-            excel_path,
-            sheet_name,
-            start_cell,
-            create_sheet,
-            options
-        )
-        return result["message"]
-    except (ValidationError, DataError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error importing from JSON: {e}")
-        raise
+    json_path = get_excel_path(json_filepath)
+    excel_path = get_excel_path(excel_filepath)
+    
+    result = await asyncio.to_thread(
+        import_json_impl,
+        json_path,
+        excel_path,
+        sheet_name,
+        start_cell,
+        create_sheet,
+        options
+    )
+    return result["message"]
 
 
 @mcp.tool()
-def convert_excel(
+async def convert_excel(
         filepath: str,
         output_filepath: str,
         format_type: str,  
@@ -871,7 +958,8 @@ def convert_excel(
         full_path = get_excel_path(filepath)
         output_path = get_excel_path(output_filepath)
         
-        result = convert_workbook_impl(
+        result = await asyncio.to_thread(
+            convert_workbook_impl,
             filepath=full_path,
             output_filepath=output_path,
             format_type=format_type,
@@ -884,11 +972,12 @@ def convert_excel(
     except ConversionError as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error converting file: {e}")
+        logger.error("Error converting file: %s", e)
         raise ConversionError(f"Failed to convert Excel file: {str(e)}")
 
 @mcp.tool()
-def get_shape_image_base64(
+@excel_tool(action="getting shape image base64")
+async def get_shape_image_base64(
         filepath: str,
         sheet_name: str,
         shape_name: str = None,
@@ -909,30 +998,53 @@ def get_shape_image_base64(
     Note: Either shape_name or shape_index must be provided. If the worksheet has no 
     shapes or the specified shape doesn't exist, an error will be returned.
     """
-    try:
-        full_path = get_excel_path(filepath)
-        from .sheet import get_shape_image_base64 as get_shape_img_b64
-        return get_shape_img_b64(
-            full_path,
-            sheet_name,
-            shape_name,
-            shape_index
-        )
-    except Exception as e:
-        logger.error(f"Error getting shape image base64: {e}")
-        raise
+    full_path = get_excel_path(filepath)
+    return await asyncio.to_thread(
+        get_shape_img_b64,
+        full_path,
+        sheet_name,
+        shape_name,
+        shape_index
+    )
+
+
+
+async def _run_streamable_http():
+    """Serve the streamable HTTP transport on Uvicorn, using httptools when installed."""
+    if not hasattr(mcp, "streamable_http_app"):
+        raise RuntimeError("The streamable-http transport requires mcp>=1.8")
+
+    import importlib.util
+    import uvicorn
+
+    config = uvicorn.Config(
+        mcp.streamable_http_app(),
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+        http="httptools" if importlib.util.find_spec("httptools") else "auto",
+        limit_concurrency=_HTTP_CONCURRENCY_LIMIT
+    )
+    await uvicorn.Server(config).serve()
 
 
 async def run_server():
     """Run the Spire.Xls MCP Server."""
     try:
-        logger.info(f"Starting Spire.Xls MCP Server (files directory: {EXCEL_FILES_PATH})")
-        await mcp.run_sse_async()
+        asyncio.get_running_loop().set_default_executor(_EXECUTOR)
+        logger.info("Starting Spire.Xls MCP Server (files directory: %s, transport: %s)",
+                    EXCEL_FILES_PATH, MCP_TRANSPORT)
+        if MCP_TRANSPORT == "streamable-http":
+            await _run_streamable_http()
+        elif MCP_TRANSPORT == "sse":
+            await mcp.run_sse_async()
+        else:
+            raise ValueError(f"Unsupported MCP_TRANSPORT '{MCP_TRANSPORT}', use 'sse' or 'streamable-http'")
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
         await mcp.shutdown()
     except Exception as e:
-        logger.error(f"Server failed: {e}")
+        logger.error("Server failed: %s", e)
         raise
     finally:
         logger.info("Server shutdown complete")
@@ -1,4 +1,5 @@
 import logging
+from itertools import chain
 from typing import Any
 import base64
 
@@ -6,6 +7,14 @@ from spire.xls import *
 
 from .cell_utils import parse_cell_range, column_to_letter, EnumMapper, create_spire_object
 from .exceptions import SheetError, ValidationError
+from .workbook import (
+    get_workbook,
+    get_sheet,
+    invalidate_sheet_index,
+    save_workbook,
+    workbook_edit,
+    workbook_lock
+)
 
 logger = logging.getLogger(__name__)
 
@@ -13,28 +22,23 @@ logger = logging.getLogger(__name__)
 def copy_sheet(filepath: str, source_sheet: str, target_sheet: str) -> dict[str, Any]:
     """Copy a worksheet within the same workbook."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
+        with workbook_edit(filepath, SheetError):
+            wb = get_workbook(filepath)
 
-        source = None
-        for ws in wb.Worksheets:
-            if ws.Name == source_sheet:
-                source = ws
-                break
+            source = get_sheet(wb, source_sheet)
+            if source is None:
+                raise SheetError(f"Source sheet '{source_sheet}' not found")
 
-        if source is None:
-            raise SheetError(f"Source sheet '{source_sheet}' not found")
-
-        for ws in wb.Worksheets:
-            if ws.Name == target_sheet:
+            if get_sheet(wb, target_sheet) is not None:
                 raise SheetError(f"Target sheet '{target_sheet}' already exists")
 
-        # Copy sheet
-        new_sheet = wb.Worksheets.AddCopy(source)
-        new_sheet.Name = target_sheet
+            # Copy sheet
+            new_sheet = wb.Worksheets.AddCopy(source)
+            new_sheet.Name = target_sheet
+            invalidate_sheet_index(wb)
 
-        wb.SaveToFile(filepath)
-        return {"message": f"Sheet '{source_sheet}' copied to '{target_sheet}'"}
+            save_workbook(wb, filepath)
+            return {"message": f"Sheet '{source_sheet}' copied to '{target_sheet}'"}
     except SheetError as e:
         logger.error(str(e))
         raise
@@ -46,24 +50,20 @@ def copy_sheet(filepath: str, source_sheet: str, target_sheet: str) -> dict[str,
 def delete_sheet(filepath: str, sheet_name: str) -> dict[str, Any]:
     """Delete a worksheet from the workbook."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
+        with workbook_edit(filepath, SheetError):
+            wb = get_workbook(filepath)
 
-        if sheet is None:
-            raise SheetError(f"Sheet '{sheet_name}' not found")
+            sheet = get_sheet(wb, sheet_name)
+            if sheet is None:
+                raise SheetError(f"Sheet '{sheet_name}' not found")
 
-        if wb.Worksheets.Count == 1:
-            raise SheetError("Cannot delete the only sheet in workbook")
+            if wb.Worksheets.Count == 1:
+                raise SheetError("Cannot delete the only sheet in workbook")
 
-        wb.Worksheets.Remove(sheet)
-        wb.SaveToFile(filepath)
-        return {"message": f"Sheet '{sheet_name}' deleted"}
+            wb.Worksheets.Remove(sheet)
+            invalidate_sheet_index(wb)
+            save_workbook(wb, filepath)
+            return {"message": f"Sheet '{sheet_name}' deleted"}
     except SheetError as e:
         logger.error(str(e))
         raise
@@ -75,25 +75,23 @@ def delete_sheet(filepath: str, sheet_name: str) -> dict[str, Any]:
 def rename_sheet(filepath: str, old_name: str, new_name: str) -> dict[str, Any]:
     """Rename a worksheet."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
+        with workbook_edit(filepath, SheetError):
+            wb = get_workbook(filepath)
 
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == old_name:
-                sheet = ws
-                break
+            sheet = get_sheet(wb, old_name)
+            if sheet is None:
+                raise SheetError(f"Sheet '{old_name}' not found")
 
-        if sheet is None:
-            raise SheetError(f"Sheet '{old_name}' not found")
+            if new_name == old_name:
+                return {"message": f"Sheet '{old_name}' already has that name"}
 
-        for ws in wb.Worksheets:
-            if ws.Name == new_name:
+            if get_sheet(wb, new_name) is not None:
                 raise SheetError(f"Sheet '{new_name}' already exists")
 
-        sheet.Name = new_name
-        wb.SaveToFile(filepath)
-        return {"message": f"Sheet renamed from '{old_name}' to '{new_name}'"}
+            sheet.Name = new_name
+            invalidate_sheet_index(wb)
+            save_workbook(wb, filepath)
+            return {"message": f"Sheet renamed from '{old_name}' to '{new_name}'"}
     except SheetError as e:
         logger.error(str(e))
         raise
@@ -117,60 +115,54 @@ def copy_range(
 ) -> dict[str, Any]:
     """Copy a range of cells to another location."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-
-        source_ws = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                source_ws = ws
-                break
-
-        if source_ws is None:
-            raise SheetError(f"Source sheet '{sheet_name}' not found")
-
-        # Get target worksheet
-        target_ws = source_ws
-        if target_sheet:
-            target_ws = None
-            for ws in wb.Worksheets:
-                if ws.Name == target_sheet:
-                    target_ws = ws
-                    break
-            if target_ws is None:
-                raise SheetError(f"Target sheet '{target_sheet}' not found")
-
-        # Parse ranges
-        source_start_row, source_start_col, source_end_row, source_end_col = parse_cell_range(source_start, source_end)
-        target_start_row, target_start_col, _, _ = parse_cell_range(target_start)
+        # Parse ranges before loading the workbook so bad input fails fast
+        try:
+            source_start_row, source_start_col, source_end_row, source_end_col = parse_cell_range(source_start, source_end)
+            target_start_row, target_start_col, _, _ = parse_cell_range(target_start)
+        except ValueError as e:
+            raise SheetError(str(e))
 
         if source_end_row is None or source_end_col is None:
             raise SheetError("Source range must specify both start and end cells")
 
-        # Calculate dimensions
-        rows = source_end_row - source_start_row + 1
-        cols = source_end_col - source_start_col + 1
-
-        # Get source range
-        source_range = source_ws.Range[source_start_row, source_start_col, source_end_row, source_end_col]
-
-        # Get target range
-        target_range = target_ws.Range[target_start_row, target_start_col,
-        target_start_row + rows - 1, target_start_col + cols - 1]
-        # Copy range
-        CellRange(source_range.Ptr).Copy(CellRange(target_range.Ptr))
-
-        wb.SaveToFile(filepath)
-
-        return {
-            "message": f"Range copied successfully",
-            "details": {
-                "source_sheet": sheet_name,
-                "source_range": f"{source_start}:{source_end}",
-                "target_sheet": target_sheet or sheet_name,
-                "target_start": target_start
+        with workbook_edit(filepath, SheetError):
+            wb = get_workbook(filepath)
+
+            source_ws = get_sheet(wb, sheet_name)
+            if source_ws is None:
+                raise SheetError(f"Source sheet '{sheet_name}' not found")
+
+            # Get target worksheet
+            target_ws = source_ws
+            if target_sheet:
+                target_ws = get_sheet(wb, target_sheet)
+                if target_ws is None:
+                    raise SheetError(f"Target sheet '{target_sheet}' not found")
+
+            # Calculate dimensions
+            rows = source_end_row - source_start_row + 1
+            cols = source_end_col - source_start_col + 1
+
+            # Get source range
+            source_range = source_ws.Range[source_start_row, source_start_col, source_end_row, source_end_col]
+
+            # Get target range
+            target_range = target_ws.Range[target_start_row, target_start_col,
+            target_start_row + rows - 1, target_start_col + cols - 1]
+            # Copy range
+            source_range.Copy(target_range)
+
+            save_workbook(wb, filepath)
+
+            return {
+                "message": f"Range copied successfully",
+                "details": {
+                    "source_sheet": sheet_name,
+                    "source_range": f"{source_start}:{source_end}",
+                    "target_sheet": target_sheet or sheet_name,
+                    "target_start": target_start
+                }
             }
-        }
     except SheetError as e:
         logger.error(str(e))
         raise
@@ -186,34 +178,27 @@ def delete_range(
         shift_direction: str = "up"
 ) -> dict[str, Any]:
     """Delete a range of cells and shift remaining cells."""
+    delete_option = DeleteOption.MoveUp if shift_direction.lower() == "up" else DeleteOption.MoveLeft
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
+        with workbook_edit(filepath, SheetError):
+            wb = get_workbook(filepath)
 
-        if sheet is None:
-            raise SheetError(f"Sheet '{sheet_name}' not found")
+            sheet = get_sheet(wb, sheet_name)
+            if sheet is None:
+                raise SheetError(f"Sheet '{sheet_name}' not found")
 
-        # Get range to delete
-        range_to_delete = sheet.Range[cell_range]
+            # Get range to delete
+            range_to_delete = sheet.Range[cell_range]
 
-        # Delete range and shift cells
-        if shift_direction.lower() == "up":
-            sheet.DeleteRange(range_to_delete, DeleteOption.MoveUp)
-        else:
-            sheet.DeleteRange(range_to_delete, DeleteOption.MoveLeft)
+            # Delete range and shift cells
+            sheet.DeleteRange(range_to_delete, delete_option)
 
-        wb.SaveToFile(filepath)
+            save_workbook(wb, filepath)
 
-        return {
-            "message": f"Range deleted and cells shifted {shift_direction}",
-            "range": f"{range_to_delete.RangeAddressLocal}"
-        }
+            return {
+                "message": f"Range deleted and cells shifted {shift_direction}",
+                "range": f"{range_to_delete.RangeAddressLocal}"
+            }
     except SheetError as e:
         logger.error(str(e))
         raise
@@ -225,23 +210,27 @@ def delete_range(
 def merge_range(filepath: str, sheet_name: str, cell_range_list: List[str]) -> dict[str, Any]:
     """Merge a range of cells."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-
-        if sheet is None:
-            raise SheetError(f"Sheet '{sheet_name}' not found")
-
-        for cell in cell_range_list:
-            sheet.Range[cell].Merge()
-
-        wb.SaveToFile(filepath)
-        return {"message": f"Range merged success in sheet '{sheet_name}'"}
+        with workbook_edit(filepath, SheetError):
+            wb = get_workbook(filepath)
+
+            sheet = get_sheet(wb, sheet_name)
+            if sheet is None:
+                raise SheetError(f"Sheet '{sheet_name}' not found")
+
+            changed = False
+            for cell in cell_range_list:
+                cell_range = sheet.Range[cell]
+                # Skip ranges that are already merged as exactly this block
+                if cell_range.HasMerged:
+                    merge_area = cell_range.MergeArea
+                    if merge_area is not None and merge_area.RangeAddressLocal == cell_range.RangeAddressLocal:
+                        continue
+                cell_range.Merge()
+                changed = True
+
+            if changed:
+                save_workbook(wb, filepath)
+            return {"message": f"Range merged success in sheet '{sheet_name}'"}
     except SheetError as e:
         logger.error(str(e))
         raise
@@ -253,24 +242,20 @@ def merge_range(filepath: str, sheet_name: str, cell_range_list: List[str]) -> d
 def unmerge_range(filepath: str, sheet_name: str, cell_range: str) -> dict[str, Any]:
     """Unmerge a range of cells."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-
-        if sheet is None:
-            raise SheetError(f"Sheet '{sheet_name}' not found")
-
-        # Create range string
-        range_to_unmerge = sheet.Range[cell_range]
-        range_to_unmerge.UnMerge()
-
-        wb.SaveToFile(filepath)
-        return {"message": f"Range '{range_to_unmerge.RangeAddressLocal}' unmerged in sheet '{sheet_name}'"}
+        with workbook_edit(filepath, SheetError):
+            wb = get_workbook(filepath)
+
+            sheet = get_sheet(wb, sheet_name)
+            if sheet is None:
+                raise SheetError(f"Sheet '{sheet_name}' not found")
+
+            # Create range string
+            range_to_unmerge = sheet.Range[cell_range]
+            # Nothing to save when no cell in the range is merged
+            if range_to_unmerge.HasMerged:
+                range_to_unmerge.UnMerge()
+                save_workbook(wb, filepath)
+            return {"message": f"Range '{range_to_unmerge.RangeAddressLocal}' unmerged in sheet '{sheet_name}'"}
     except SheetError as e:
         logger.error(str(e))
         raise
@@ -288,25 +273,21 @@ def copy_range_operation(
 ) -> dict:
     """Copy a range of cells to another location."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-
-        if sheet is None:
-            logger.error(f"Sheet '{sheet_name}' not found")
-            raise ValidationError(f"Sheet '{sheet_name}' not found")
-
-        source_ws = wb.Worksheets[sheet_name]
-        target_ws = wb.Worksheets[target_sheet] if target_sheet else source_ws
+        with workbook_edit(filepath, ValidationError, SheetError):
+            wb = get_workbook(filepath)
+            source_ws = get_sheet(wb, sheet_name)
+            if source_ws is None:
+                logger.error(f"Sheet '{sheet_name}' not found")
+                raise ValidationError(f"Sheet '{sheet_name}' not found")
+            target_ws = get_sheet(wb, target_sheet) if target_sheet else source_ws
+            if target_ws is None:
+                logger.error(f"Sheet '{target_sheet}' not found")
+                raise ValidationError(f"Sheet '{target_sheet}' not found")
 
-        source_ws.Range[source_range].Copy(target_ws.Range[target_range], True, True)
+            source_ws.Range[source_range].Copy(target_ws.Range[target_range], True, True)
 
-        wb.SaveToFile(filepath)
-        return {"message": f"Range copied successfully"}
+            save_workbook(wb, filepath)
+            return {"message": f"Range copied successfully"}
 
     except (ValidationError, SheetError):
         raise
@@ -336,56 +317,78 @@ def apply_autofilter(
         Dictionary with result message
     """
     try:
-        # Load workbook
-        workbook = Workbook()
-        workbook.LoadFromFile(filepath)
-        
-        # Ensure worksheet exists
-        if sheet_name not in [sheet.Name for sheet in workbook.Worksheets]:
-            raise SheetError(f"Worksheet '{sheet_name}' does not exist")
+        with workbook_edit(filepath, SheetError):
+            # Load workbook
+            workbook = get_workbook(filepath)
         
-        sheet = workbook.Worksheets[sheet_name]
+            # Ensure worksheet exists
+            sheet = get_sheet(workbook, sheet_name)
+            if sheet is None:
+                raise SheetError(f"Worksheet '{sheet_name}' does not exist")
         
-        # Apply auto filter
-        try:
-            auto_filters = sheet.AutoFilters
-            auto_filters.Range = sheet.Range[cell_range]
-            if filter_criteria:
-                for col_index, criteria in filter_criteria.items():
-                    filter_column = auto_filters[col_index]
-                    
-                    if criteria.get("type") == "value":
-                        filter_values = criteria.get("values", [])
-                        for value in filter_values:
-                            auto_filters.AddFilter(filter_column, str(value))
-                    
-                    elif criteria.get("type") == "custom":
-                        operator = criteria.get("operator")
-                        criteria_value = criteria.get("criteria")
-                        filter_operator = EnumMapper.get_filter_operator_enum(operator)
-                        
-                        spire_value = create_spire_object(criteria_value)
-                        auto_filters.CustomFilter(filter_column, filter_operator, spire_value)
-
-                    elif criteria.get("type") == "top10":
-                        count = criteria.get("count", 10)
-                        percent = criteria.get("percent", False)
-                        bottom = criteria.get("bottom", False)
-
-                        auto_filters.FilterTop10(filter_column, not bottom, percent, count)
+            # Apply auto filter
+            try:
+                # Resolve every column's criteria before touching the sheet
+                compiled = [(col_index, _compile_filter_criteria(criteria))
+                            for col_index, criteria in (filter_criteria or {}).items()]
+
+                auto_filters = sheet.AutoFilters
+                auto_filters.Range = sheet.Range[cell_range]
+                if compiled:
+                    for col_index, apply_criteria in compiled:
+                        filter_column = auto_filters[col_index]
+                        if apply_criteria is not None:
+                            apply_criteria(auto_filters, filter_column)
+                    # Evaluate every column's criteria in one pass over the range
                     auto_filters.Filter()
-        except Exception as e:
-            raise ValidationError(f"Error applying autofilter: {str(e)}")
+            except Exception as e:
+                raise ValidationError(f"Error applying autofilter: {str(e)}")
         
-        # Save workbook
-        workbook.SaveToFile(filepath)
-        workbook.Dispose()
+            # Save workbook
+            save_workbook(workbook, filepath)
         
-        return {"message": "Autofilter successfully applied"}
+            return {"message": "Autofilter successfully applied"}
+    except (SheetError, ValidationError) as e:
+        logger.error(str(e))
+        raise
     except Exception as e:
+        logger.error(f"Failed to apply autofilter: {e}")
         raise SheetError(f"Failed to apply autofilter: {str(e)}")
 
 
+def _compile_filter_criteria(criteria: dict):
+    """Resolve one column's filter settings into a function(auto_filters, filter_column).
+
+    Returns None for an unknown filter type, which is ignored.
+    """
+    filter_type = criteria.get("type")
+    if filter_type == "value":
+        filter_values = [str(value) for value in criteria.get("values", [])]
+
+        def apply_criteria(auto_filters, filter_column):
+            for value in filter_values:
+                auto_filters.AddFilter(filter_column, value)
+
+    elif filter_type == "custom":
+        filter_operator = EnumMapper.get_filter_operator_enum(criteria.get("operator"))
+        spire_value = create_spire_object(criteria.get("criteria"))
+
+        def apply_criteria(auto_filters, filter_column):
+            auto_filters.CustomFilter(filter_column, filter_operator, spire_value)
+
+    elif filter_type == "top10":
+        count = criteria.get("count", 10)
+        percent = criteria.get("percent", False)
+        top = not criteria.get("bottom", False)
+
+        def apply_criteria(auto_filters, filter_column):
+            auto_filters.FilterTop10(filter_column, top, percent, count)
+
+    else:
+        return None
+    return apply_criteria
+
+
 def get_shape_image_base64(filepath, sheet_name, shape_name=None, shape_index=None):
     """
     Export a specified Shape object from an Excel worksheet as an image and return its base64 string.
@@ -404,30 +407,38 @@ def get_shape_image_base64(filepath, sheet_name, shape_name=None, shape_index=No
         Exception: For other errors during export or file operations.
     """
 
-    workbook = Workbook()
-    workbook.LoadFromFile(filepath)
-    sheet = workbook.Worksheets[sheet_name]
-
-    # Get Shape
-    if shape_name:
-        shape = next((s for s in sheet.PrstGeomShapes if s.Name == shape_name),
-                     next((s for s in sheet.Pictures if s.Name == shape_name), None))
-        if shape is None:
-            raise ValueError(f"Shape '{shape_name}' not found in sheet '{sheet_name}'")
-    elif shape_index is not None:
-        if shape_index < sheet.PrstGeomShapes.Count:
-            shape = sheet.PrstGeomShapes[shape_index]
-        elif shape_index < sheet.Pictures.Count:
-            shape = sheet.Pictures[shape_index]
+    with workbook_lock(filepath):
+        workbook = get_workbook(filepath)
+        sheet = get_sheet(workbook, sheet_name)
+        if sheet is None:
+            raise ValueError(f"Sheet '{sheet_name}' not found")
+
+        # Get Shape
+        if shape_name:
+            # One lazy pass: shapes first, pictures only if no shape matches
+            shape = next((s for s in chain(sheet.PrstGeomShapes, sheet.Pictures) if s.Name == shape_name),
+                         None)
+            if shape is None:
+                raise ValueError(f"Shape '{shape_name}' not found in sheet '{sheet_name}'")
+        elif shape_index is not None:
+            shapes = sheet.PrstGeomShapes
+            if shape_index < shapes.Count:
+                shape = shapes[shape_index]
+            elif shape_index < sheet.Pictures.Count:
+                shape = sheet.Pictures[shape_index]
+            else:
+                raise ValueError(f"Shape '{shape_index}' not found in sheet '{sheet_name}'")
         else:
-            raise ValueError(f"Shape '{shape_index}' not found in sheet '{sheet_name}'")
-    else:
-        raise ValueError("Must provide shape_name or shape_index")
-
-    # Export as image to memory stream
-    img_bytes = shape.SaveToImage().ToArray()
-    workbook.Dispose()
+            raise ValueError("Must provide shape_name or shape_index")
 
-    # Convert to base64
-    base64_str = base64.b64encode(img_bytes).decode("utf-8")
-    return base64_str
+        # Export as image to memory stream; release the native copy once marshalled
+        stream = shape.SaveToImage()
+        try:
+            img_bytes = stream.ToArray()
+        finally:
+            stream.Dispose()
+
+    # Convert to base64, dropping the raw bytes before the str copy is made
+    encoded = base64.b64encode(img_bytes)
+    del img_bytes
+    return encoded.decode("ascii")
@@ -1,13 +1,20 @@
 import logging
 import re
-from typing import Any, Tuple
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 from spire.xls import *
 
-from .cell_utils import parse_cell_range, validate_cell_reference_regex, column_to_letter
+from .cell_utils import parse_cell_range, parse_ref_fast, validate_cell_reference_regex, column_to_letter
 from .exceptions import ValidationError
+from .workbook import get_workbook, get_sheet, workbook_lock
 
 logger = logging.getLogger(__name__)
 
+# Worksheet size limits (.xlsx)
+_MAX_ROW = 1048576
+_MAX_COLUMN = 16384
+
 
 def validate_formula(formula: str) -> Tuple[bool, str]:
     """Validate Excel formula syntax."""
@@ -17,14 +24,63 @@ def validate_formula(formula: str) -> Tuple[bool, str]:
     if not formula.startswith('='):
         formula = f'={formula}'
 
+    result = cached_formula_result(formula)
+    if result is None:
+        result = _check_formula(formula)
+        remember_formula_result(formula, *result)
+    return result
+
+
+# Results of the scratch-workbook syntax check by formula text, read by the
+# formula-write path to fail fast; the least recently used entry is dropped when full
+_FORMULA_CACHE: "OrderedDict[str, Tuple[bool, str]]" = OrderedDict()
+_FORMULA_CACHE_SIZE = 8192
+_FORMULA_CACHE_LOCK = threading.Lock()
+
+
+def cached_formula_result(formula: str) -> Optional[Tuple[bool, str]]:
+    """Return the cached (valid, message) for a formula, or None if it hasn't been checked."""
+    with _FORMULA_CACHE_LOCK:
+        result = _FORMULA_CACHE.get(formula)
+        if result is not None:
+            _FORMULA_CACHE.move_to_end(formula)
+        return result
+
+
+def remember_formula_result(formula: str, valid: bool, message: str) -> None:
+    """Record a formula's syntax check result in the shared cache."""
+    with _FORMULA_CACHE_LOCK:
+        _FORMULA_CACHE[formula] = (valid, message)
+        _FORMULA_CACHE.move_to_end(formula)
+        if len(_FORMULA_CACHE) > _FORMULA_CACHE_SIZE:
+            _FORMULA_CACHE.popitem(last=False)
+
+
+def clear_formula_cache() -> None:
+    """Forget every cached formula check result."""
+    with _FORMULA_CACHE_LOCK:
+        _FORMULA_CACHE.clear()
+
+
+# Workbook whose first sheet formulas are parsed on; Spire objects aren't thread-safe
+_FORMULA_WB = None
+_FORMULA_WB_LOCK = threading.Lock()
+
+
+def _check_formula(formula: str) -> Tuple[bool, str]:
+    """Let Spire parse a formula on a scratch cell."""
+    global _FORMULA_WB
     # Basic formula validation
     try:
-        # Create temporary workbook and worksheet for validation
-        wb = Workbook()
-        sheet = wb.Worksheets[0]
+        with _FORMULA_WB_LOCK:
+            if _FORMULA_WB is None:
+                _FORMULA_WB = Workbook()
+            cell = _FORMULA_WB.Worksheets[0].Range["A1"]
+            # Clear first, or Spire's error message quotes the previous formula
+            cell.ClearAll()
 
-        # Try to set formula
-        sheet.Range["A1"].Formula = formula
+            # Try to set formula
+            cell.Formula = formula
 
         # If no exception was raised, formula is valid
         return True, "Formula syntax is valid"
@@ -40,58 +96,54 @@ def validate_range_in_sheet(
 ) -> dict[str, Any]:
     """Validate if range exists and is properly formatted."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-
-        if sheet is None:
-            raise ValidationError(f"Sheet '{sheet_name}' not found")
-
-        # Parse range
-        try:
-            if ':' in range_str:
-                start_cell, end_cell = range_str.split(':')
-            else:
-                start_cell = range_str
-                end_cell = None
-
-            start_row, start_col, end_row, end_col = parse_cell_range(start_cell, end_cell)
-
-            # Validate start cell is within sheet bounds
-            if start_row > sheet.LastRow or start_col > sheet.LastColumn:
-                raise ValidationError(
-                    f"Start cell out of bounds. Sheet dimensions are "
-                    f"A1:{column_to_letter(sheet.LastColumn)}{sheet.LastRow}"
-                )
-
-            # If end cell specified, validate it's within bounds and after start cell
-            if end_row is not None and end_col is not None:
-                if end_row > sheet.LastRow or end_col > sheet.LastColumn:
+        with workbook_lock(filepath):
+            wb = get_workbook(filepath)
+
+            sheet = get_sheet(wb, sheet_name)
+            if sheet is None:
+                raise ValidationError(f"Sheet '{sheet_name}' not found")
+
+            # Parse range
+            try:
+                if ':' in range_str:
+                    start_cell, end_cell = range_str.split(':')
+                else:
+                    start_cell = range_str
+                    end_cell = None
+
+                start_row, start_col, end_row, end_col = parse_cell_range(start_cell, end_cell)
+                last_row, last_col = sheet.LastRow, sheet.LastColumn
+
+                # Validate start cell is within sheet bounds
+                if start_row > last_row or start_col > last_col:
                     raise ValidationError(
-                        f"End cell out of bounds. Sheet dimensions are "
-                        f"A1:{column_to_letter(sheet.LastColumn)}{sheet.LastRow}"
+                        f"Start cell out of bounds. Sheet dimensions are "
+                        f"A1:{column_to_letter(last_col)}{last_row}"
                     )
-                if end_row < start_row or end_col < start_col:
-                    raise ValidationError("End cell must be after start cell")
 
-            return {
-                "message": "Range is valid",
-                "range": range_str,
-                "dimensions": {
-                    "start_row": start_row,
-                    "start_col": start_col,
-                    "end_row": end_row,
-                    "end_col": end_col
+                # If end cell specified, validate it's within bounds and after start cell
+                if end_row is not None and end_col is not None:
+                    if end_row > last_row or end_col > last_col:
+                        raise ValidationError(
+                            f"End cell out of bounds. Sheet dimensions are "
+                            f"A1:{column_to_letter(last_col)}{last_row}"
+                        )
+                    if end_row < start_row or end_col < start_col:
+                        raise ValidationError("End cell must be after start cell")
+
+                return {
+                    "message": "Range is valid",
+                    "range": range_str,
+                    "dimensions": {
+                        "start_row": start_row,
+                        "start_col": start_col,
+                        "end_row": end_row,
+                        "end_col": end_col
+                    }
                 }
-            }
 
-        except ValueError as e:
-            raise ValidationError(f"Invalid range format: {str(e)}")
+            except ValueError as e:
+                raise ValidationError(f"Invalid range format: {str(e)}")
 
     except ValidationError as e:
         logger.error(str(e))
@@ -108,59 +160,60 @@ def validate_range_in_sheet_operation(
 ) -> dict[str, Any]:
     """Validate if a range exists in a worksheet and return data range info."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-        sheet = None
-        for ws in wb.Worksheets:
-            if ws.Name == sheet_name:
-                sheet = ws
-                break
-
-        if sheet is None:
-            raise ValidationError(f"Sheet '{sheet_name}' not found")
-
-        worksheet = wb.Worksheets[sheet_name]
-
-        # Get actual data dimensions
-        data_max_row = worksheet.LastRow
-        data_max_col = worksheet.LastColumn
-
-        # Validate range
-        valid_range = worksheet.Range[cell_range]
-        start_row, start_col = valid_range.Row, valid_range.Column
-        end_row, end_col = valid_range.LastRow, valid_range.LastColumn
-
-        # Validate bounds against maximum possible Excel limits
-        is_valid, message = validate_range_bounds(
-            worksheet, start_row, start_col, end_row, end_col
-        )
-        if not is_valid:
-            raise ValidationError(message)
-
-        range_str = valid_range.RangeAddressLocal
-        data_range_str = f"A1:{column_to_letter(data_max_col)}{data_max_row}"
-
-        # Check if range is within data or extends beyond
-        extends_beyond_data = (
-                end_row > data_max_row or
-                end_col > data_max_col
-        )
-
-        return {
-            "message": (
-                f"Range '{range_str}' is valid. "
-                f"Sheet contains data in range '{data_range_str}'"
-            ),
-            "valid": True,
-            "range": range_str,
-            "data_range": data_range_str,
-            "extends_beyond_data": extends_beyond_data,
-            "data_dimensions": {
-                "max_row": data_max_row,
-                "max_col": data_max_col,
-                "max_col_letter": column_to_letter(data_max_col)
+        # Plain references are parsed without asking Spire, before taking the lock
+        bounds = _parse_plain_range(cell_range)
+
+        with workbook_lock(filepath):
+            wb = get_workbook(filepath)
+            worksheet = get_sheet(wb, sheet_name)
+            if worksheet is None:
+                raise ValidationError(f"Sheet '{sheet_name}' not found")
+
+            # Get actual data dimensions
+            data_max_row = worksheet.LastRow
+            data_max_col = worksheet.LastColumn
+
+            # Validate range
+            if bounds is not None:
+                start_row, start_col, end_row, end_col = bounds
+                range_str = _range_address(start_row, start_col, end_row, end_col)
+            else:
+                valid_range = worksheet.Range[cell_range]
+                start_row, start_col = valid_range.Row, valid_range.Column
+                end_row, end_col = valid_range.LastRow, valid_range.LastColumn
+                range_str = valid_range.RangeAddressLocal
+
+            # Validate bounds against maximum possible Excel limits
+            is_valid, message = validate_range_bounds(
+                worksheet, start_row, start_col, end_row, end_col,
+                max_row=data_max_row, max_col=data_max_col
+            )
+            if not is_valid:
+                raise ValidationError(message)
+
+            data_range_str = f"A1:{column_to_letter(data_max_col)}{data_max_row}"
+
+            # Check if range is within data or extends beyond
+            extends_beyond_data = (
+                    end_row > data_max_row or
+                    end_col > data_max_col
+            )
+
+            return {
+                "message": (
+                    f"Range '{range_str}' is valid. "
+                    f"Sheet contains data in range '{data_range_str}'"
+                ),
+                "valid": True,
+                "range": range_str,
+                "data_range": data_range_str,
+                "extends_beyond_data": extends_beyond_data,
+                "data_dimensions": {
+                    "max_row": data_max_row,
+                    "max_col": data_max_col,
+                    "max_col_letter": column_to_letter(data_max_col)
+                }
             }
-        }
     except ValidationError as e:
         logger.error(str(e))
         raise
@@ -169,16 +222,49 @@ def validate_range_in_sheet_operation(
         raise ValidationError(str(e))
 
 
+def _parse_plain_range(cell_range: str) -> Optional[Tuple[int, int, int, int]]:
+    """Return (start_row, start_col, end_row, end_col) for a plain "A1" or "A1:D10" reference.
+
+    Returns None for anything else (names, whole rows or columns, reversed or
+    out-of-limit ranges); those are left to Spire.
+    """
+    start, sep, end = cell_range.replace('$', '').partition(':')
+    first = parse_ref_fast(start)
+    last = parse_ref_fast(end) if sep else first
+    if first is None or last is None:
+        return None
+    (start_col, start_row), (end_col, end_row) = first, last
+    if not (start_row <= end_row <= _MAX_ROW and start_col <= end_col <= _MAX_COLUMN):
+        return None
+    return start_row, start_col, end_row, end_col
+
+
+def _range_address(start_row: int, start_col: int, end_row: int, end_col: int) -> str:
+    """Format a range the way Spire's RangeAddressLocal does ("B2", "A1:D10")."""
+    start = f"{column_to_letter(start_col)}{start_row}"
+    if (start_row, start_col) == (end_row, end_col):
+        return start
+    return f"{start}:{column_to_letter(end_col)}{end_row}"
+
+
 def validate_range_bounds(
         worksheet: Worksheet,
         start_row: int,
         start_col: int,
         end_row: int | None = None,
         end_col: int | None = None,
+        max_row: int | None = None,
+        max_col: int | None = None,
 ) -> tuple[bool, str]:
-    """Validate that cell range is within worksheet bounds"""
-    max_row = worksheet.LastRow
-    max_col = worksheet.LastColumn
+    """Validate that cell range is within worksheet bounds.
+
+    max_row and max_col default to the worksheet's used range; callers that
+    already read it pass it in to save the lookups.
+    """
+    if max_row is None:
+        max_row = worksheet.LastRow
+    if max_col is None:
+        max_col = worksheet.LastColumn
 
     try:
         # Check start cell bounds
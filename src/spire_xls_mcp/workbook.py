@@ -1,4 +1,10 @@
 import logging
+import os
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
@@ -9,21 +15,57 @@ from .exceptions import WorkbookError
 
 logger = logging.getLogger(__name__)
 
+# Loaded workbooks keyed by absolute path -> (mtime at load/save, workbook),
+# least recently used first
+_WB_CACHE: OrderedDict[str, tuple[float, Workbook]] = OrderedDict()
+# Number of clean workbooks kept loaded; dirty ones are never evicted
+_WB_CACHE_SIZE = 8
+# Paths whose cached workbook has changes not yet written to disk
+_DIRTY: set[str] = set()
+# Paths whose formulas were written without being calculated
+_NEEDS_RECALC: set[str] = set()
+
+
+# Paths inside a batch_edits() block -> nesting depth; saves are deferred until it exits
+_BATCH_DEPTH: dict[str, int] = {}
+# Paths with a batch opened by begin_batch(); saves are deferred until it is committed or aborted
+_OPEN_BATCHES: set[str] = set()
+
+
+# Per-path locks serializing access to a cached workbook across threads
+_LOCKS: dict[str, threading.RLock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _cache_key(filepath: str) -> str:
+    return os.path.abspath(filepath)
+
+
+def workbook_lock(filepath: str) -> threading.RLock:
+    """Return the lock guarding the cached workbook for filepath."""
+    key = _cache_key(filepath)
+    with _LOCKS_GUARD:
+        return _LOCKS.setdefault(key, threading.RLock())
+
 
 def create_workbook(filepath: str, sheet_name: str = None) -> dict[str, Any]:
     """Create a new Excel workbook with optional custom sheet name"""
     try:
         wb = Workbook()
-        wb.Worksheets.RemoveAt(1)
-        wb.Worksheets.RemoveAt(1)
-        # Rename default sheet
+        sheets = wb.Worksheets
+        # Keep only the first of the three default sheets, renamed if asked
+        sheets.RemoveAt(2)
+        sheets.RemoveAt(1)
         if sheet_name is not None:
-            wb.Worksheets.Clear()
-            sheet = wb.Worksheets.Add(sheet_name)
+            sheets[0].Name = sheet_name
 
         save_path = Path(filepath)
         save_path.parent.mkdir(parents=True, exist_ok=True)
-        wb.SaveToFile(str(save_path))
+        with workbook_lock(filepath):
+            wb.SaveToFile(str(save_path))
+            # The new workbook replaces any cached copy of a file it overwrote
+            discard_workbook(filepath)
+            _remember_workbook(_cache_key(filepath), os.path.getmtime(filepath), wb)
         return {
             "message": f"Created workbook: {filepath}",
             "active_sheet": sheet_name,
@@ -34,35 +76,343 @@ def create_workbook(filepath: str, sheet_name: str = None) -> dict[str, Any]:
         raise WorkbookError(f"Failed to create workbook: {e!s}")
 
 
+def load_workbook(filepath: str) -> Workbook:
+    """Load a workbook from disk, bypassing the workbook cache."""
+    wb = Workbook()
+    wb.LoadFromFile(str(filepath))
+    return wb
+
+
+@contextmanager
+def open_workbook(filepath: str):
+    """Load a private copy of a workbook, bypassing the cache, and dispose it on exit."""
+    wb = load_workbook(filepath)
+    try:
+        yield wb
+    finally:
+        _dispose(wb)
+
+
+def _dispose(wb: Workbook) -> None:
+    """Release a workbook's native resources now instead of when it is garbage collected."""
+    try:
+        wb.Dispose()
+    except Exception as e:
+        logger.debug(f"Failed to dispose workbook: {e}")
+
+
+def _remember_workbook(key: str, mtime: float, wb: Workbook) -> None:
+    """Store a workbook as most recently used and evict the oldest clean entries.
+
+    Evicted workbooks are disposed. Entries whose lock another thread holds
+    may be in use, so they stay cached until a later eviction.
+    """
+    _WB_CACHE[key] = (mtime, wb)
+    _WB_CACHE.move_to_end(key)
+    if len(_WB_CACHE) > _WB_CACHE_SIZE:
+        for old_key in [k for k in _WB_CACHE if k not in _DIRTY and k != key]:
+            lock = workbook_lock(old_key)
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                _dispose(_WB_CACHE.pop(old_key)[1])
+            finally:
+                lock.release()
+            if len(_WB_CACHE) <= _WB_CACHE_SIZE:
+                break
+
+
+def get_workbook(filepath: str) -> Workbook:
+    """Get an existing workbook, reusing the cached copy while the file is unchanged.
+
+    Loaded workbooks are cached per path and reused while the file's mtime is
+    unchanged, so consecutive calls share a single parse of the file.
+    """
+    key = _cache_key(filepath)
+    if not os.path.exists(filepath):
+        raise WorkbookError(f"File not found: {filepath}")
+    with workbook_lock(filepath):
+        mtime = os.path.getmtime(filepath)
+        cached = _WB_CACHE.get(key)
+        if cached is not None:
+            if cached[0] == mtime:
+                _WB_CACHE.move_to_end(key)
+                return cached[1]
+            if key in _DIRTY:
+                logger.warning(f"Discarding unsaved changes to {filepath}: file was modified on disk")
+            discard_workbook(filepath)
+        wb = load_workbook(filepath)
+        _remember_workbook(key, mtime, wb)
+        return wb
+
+
 def get_or_create_workbook(filepath: str) -> Workbook:
-    """Get existing workbook or create new one if it doesn't exist"""
+    """Get existing workbook or create new one if it doesn't exist."""
     try:
-        wb = Workbook()
         if Path(filepath).exists():
-            wb.LoadFromFile(filepath)
-        else:
-            wb = create_workbook(filepath)["workbook"]
-        return wb
+            return get_workbook(filepath)
+        return create_workbook(filepath)["workbook"]
     except Exception as e:
         logger.error(f"Failed to get or create workbook: {e}")
         raise WorkbookError(f"Failed to get or create workbook: {e!s}")
 
 
+def get_sheet_index(wb: Workbook) -> dict[str, Any]:
+    """Return a name -> worksheet mapping memoized on the workbook."""
+    index = getattr(wb, "_name_index", None)
+    if index is None:
+        # Index by position: iterating Worksheets yields XlsWorksheet objects,
+        # whose ranges lack members such as Range.Copy
+        sheets = wb.Worksheets
+        index = {ws.Name: ws for ws in (sheets[i] for i in range(sheets.Count))}
+        wb._name_index = index
+    return index
+
+
+def invalidate_sheet_index(wb: Workbook) -> None:
+    """Drop the memoized sheet index after sheets are added, removed or renamed."""
+    wb._name_index = None
+
+
+def get_sheet(wb: Workbook, sheet_name: str):
+    """Look up a worksheet by name, or None if it doesn't exist."""
+    return get_sheet_index(wb).get(sheet_name)
+
+
+def get_or_create_sheet(wb: Workbook, sheet_name: str):
+    """Look up a worksheet by name, creating it if it doesn't exist."""
+    sheet = get_sheet(wb, sheet_name)
+    if sheet is None:
+        sheet = wb.CreateEmptySheet(sheet_name)
+        invalidate_sheet_index(wb)
+    return sheet
+
+
+def mark_dirty(filepath: str, recalculate: bool = False) -> None:
+    """Flag the cached workbook for filepath as having unsaved changes.
+
+    With recalculate=True the workbook is calculated once when it is flushed.
+    """
+    key = _cache_key(filepath)
+    _DIRTY.add(key)
+    if recalculate:
+        _NEEDS_RECALC.add(key)
+
+
+def _write_workbook(wb: Workbook, filepath: str) -> None:
+    """Write a workbook to disk atomically and keep its cache entry in sync.
+
+    Formulas left uncalculated by earlier deferred writes are calculated first.
+    The file is written next to the target and swapped in with os.replace, so
+    a failed save never leaves a truncated workbook behind.
+    """
+    key = _cache_key(filepath)
+    if key in _NEEDS_RECALC:
+        wb.CalculateAllValue()
+        _NEEDS_RECALC.discard(key)
+    # Keep the extension: Spire picks the file format from it
+    root, ext = os.path.splitext(filepath)
+    tmp_path = f"{root}.{os.getpid()}.tmp{ext}"
+    try:
+        wb.SaveToFile(tmp_path)
+        os.replace(tmp_path, filepath)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _DIRTY.discard(key)
+    _remember_workbook(key, os.path.getmtime(filepath), wb)
+
+
+def _saves_deferred(key: str) -> bool:
+    return bool(_BATCH_DEPTH.get(key)) or key in _OPEN_BATCHES
+
+
+def save_workbook(wb: Workbook, filepath: str) -> None:
+    """Save a workbook, or only mark it dirty while a batch is open.
+
+    Only the cached copy of filepath can be deferred: any other workbook (e.g.
+    one built for a file that doesn't exist yet) is written right away, since
+    no cache entry would hold its changes until the batch ends.
+    """
+    key = _cache_key(filepath)
+    if _saves_deferred(key):
+        cached = _WB_CACHE.get(key)
+        if cached is not None and cached[1] is wb:
+            mark_dirty(filepath)
+            return
+    _write_workbook(wb, filepath)
+
+
+def discard_workbook(filepath: str) -> None:
+    """Drop and dispose the cached workbook for filepath, e.g. after a failed edit."""
+    key = _cache_key(filepath)
+    with workbook_lock(filepath):
+        cached = _WB_CACHE.pop(key, None)
+        _DIRTY.discard(key)
+        _NEEDS_RECALC.discard(key)
+        if cached is not None:
+            _dispose(cached[1])
+
+
+@contextmanager
+def workbook_edit(filepath: str, *expected: type[Exception]):
+    """Hold the workbook lock for an edit and clean up the cache if the edit fails.
+
+    When the block raises anything other than the expected exception types
+    (lookup and validation failures raised before anything is changed), the
+    cached workbook may be half edited. If it had no unsaved changes it is
+    discarded, so the next call reloads the file. If it already held unsaved
+    changes (flush=False formulas or an open batch) it is kept, since
+    discarding it would lose them; the failed edit may then be partly applied.
+    Both happen before the lock is released.
+    """
+    key = _cache_key(filepath)
+    with workbook_lock(filepath):
+        had_pending_changes = key in _DIRTY
+        try:
+            yield
+        except expected:
+            raise
+        except Exception:
+            if had_pending_changes:
+                logger.warning(f"Edit of {filepath} failed; keeping its unsaved changes, "
+                               f"which may include part of the failed edit")
+            else:
+                discard_workbook(filepath)
+            raise
+
+
+def flush_workbook(filepath: str) -> dict[str, Any]:
+    """Write pending changes of a cached workbook to disk."""
+    try:
+        key = _cache_key(filepath)
+        with workbook_lock(filepath):
+            if _saves_deferred(key):
+                return {"message": f"Save of {filepath} deferred until the batch ends", "saved": False}
+            cached = _WB_CACHE.get(key)
+            if cached is None or key not in _DIRTY:
+                return {"message": f"No pending changes for {filepath}", "saved": False}
+
+            _write_workbook(cached[1], filepath)
+        return {"message": f"Workbook saved: {filepath}", "saved": True}
+    except Exception as e:
+        logger.error(f"Failed to flush workbook: {e}")
+        raise WorkbookError(f"Failed to flush workbook: {e!s}")
+
+
+def flush_all_workbooks(close_batches: bool = False) -> list[str]:
+    """Write every cached workbook with pending changes to disk; returns the saved paths.
+
+    With close_batches=True, batches that are still open are closed first so
+    their changes are saved too, as when the server shuts down. A workbook
+    that fails to save is logged and skipped.
+    """
+    saved = []
+    for key in list(_DIRTY):
+        with workbook_lock(key):
+            if close_batches:
+                _OPEN_BATCHES.discard(key)
+                _BATCH_DEPTH.pop(key, None)
+            try:
+                if flush_workbook(key)["saved"]:
+                    saved.append(key)
+            except WorkbookError:
+                # flush_workbook has logged the failure
+                continue
+    return saved
+
+
+@contextmanager
+def batch_edits(filepath: str):
+    """Defer saves of filepath until the block exits, then save once.
+
+    Edits made inside the block (write_data, format_range, apply_formula, ...)
+    only mark the cached workbook dirty. The workbook lock is held for the
+    whole block. If the block raises, the pending changes are left unsaved in
+    the cache; call flush_workbook() or discard_workbook() to resolve them.
+    """
+    key = _cache_key(filepath)
+    with workbook_lock(filepath):
+        _BATCH_DEPTH[key] = _BATCH_DEPTH.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            _BATCH_DEPTH[key] -= 1
+            outermost = not _BATCH_DEPTH[key]
+            if outermost:
+                del _BATCH_DEPTH[key]
+        # Only reached when the block didn't raise
+        if outermost:
+            flush_workbook(filepath)
+
+
+def begin_batch(filepath: str) -> dict[str, Any]:
+    """Defer saves of filepath across calls until commit_batch() or abort_batch().
+
+    Unlike batch_edits(), the batch stays open between calls (e.g. between MCP
+    tool requests) and no lock is held while it is open. Edits only update the
+    cached workbook, which is loaded here so the batch starts from the file.
+    """
+    try:
+        key = _cache_key(filepath)
+        with workbook_lock(filepath):
+            if key in _OPEN_BATCHES:
+                raise WorkbookError(f"A batch is already open for {filepath}")
+            get_workbook(filepath)
+            _OPEN_BATCHES.add(key)
+        return {"message": f"Batch started for {filepath}; changes are saved by commit_batch"}
+    except WorkbookError as e:
+        logger.error(str(e))
+        raise
+    except Exception as e:
+        logger.error(f"Failed to begin batch: {e}")
+        raise WorkbookError(f"Failed to begin batch: {e!s}")
+
+
+def commit_batch(filepath: str, recalculate: bool = False) -> dict[str, Any]:
+    """Close the batch opened by begin_batch() and save its changes once.
+
+    With recalculate=True every formula in the workbook is calculated before saving.
+    """
+    key = _cache_key(filepath)
+    with workbook_lock(filepath):
+        if key not in _OPEN_BATCHES:
+            raise WorkbookError(f"No batch is open for {filepath}")
+        _OPEN_BATCHES.discard(key)
+        if recalculate and key in _WB_CACHE:
+            mark_dirty(filepath, recalculate=True)
+        return flush_workbook(filepath)
+
+
+def abort_batch(filepath: str) -> dict[str, Any]:
+    """Close the batch opened by begin_batch() and drop its unsaved changes."""
+    key = _cache_key(filepath)
+    with workbook_lock(filepath):
+        if key not in _OPEN_BATCHES:
+            raise WorkbookError(f"No batch is open for {filepath}")
+        _OPEN_BATCHES.discard(key)
+        discarded = key in _DIRTY
+        discard_workbook(filepath)
+    if discarded:
+        return {"message": f"Batch aborted; unsaved changes to {filepath} were discarded"}
+    return {"message": f"Batch aborted; {filepath} had no unsaved changes"}
+
+
 def create_sheet(filepath: str, sheet_name: str) -> dict:
     """Create a new worksheet in the workbook if it doesn't exist."""
     try:
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
+        with workbook_edit(filepath, WorkbookError):
+            wb = get_workbook(filepath)
 
-        # Check if sheet already exists
-        for sheet in wb.Worksheets:
-            if sheet.Name == sheet_name:
+            # Check if sheet already exists
+            if get_sheet(wb, sheet_name) is not None:
                 raise WorkbookError(f"Sheet {sheet_name} already exists")
 
-        # Create new sheet
-        wb.CreateEmptySheet(sheet_name)
-        wb.SaveToFile(filepath)
-        return {"message": f"Sheet {sheet_name} created successfully"}
+            # Create new sheet
+            wb.CreateEmptySheet(sheet_name)
+            invalidate_sheet_index(wb)
+            save_workbook(wb, filepath)
+            return {"message": f"Sheet {sheet_name} created successfully"}
     except WorkbookError as e:
         logger.error(str(e))
         raise
@@ -71,32 +421,90 @@ def create_sheet(filepath: str, sheet_name: str) -> dict:
         raise WorkbookError(str(e))
 
 
+# SpreadsheetML namespaces for reading sheet names straight from an .xlsx package
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_DOC_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _read_sheet_names(path: Path) -> list[str] | None:
+    """List worksheet names from an .xlsx package's workbook part, without loading it.
+
+    Returns None for anything this can't answer exactly (legacy .xls, chart
+    sheets, non-standard part names), so the caller falls back to Spire.
+    """
+    if not zipfile.is_zipfile(path):
+        return None
+    try:
+        with zipfile.ZipFile(path) as package:
+            with package.open("xl/_rels/workbook.xml.rels") as part:
+                rel_types = {
+                    rel.get("Id"): rel.get("Type", "")
+                    for rel in ET.parse(part).getroot().iter(f"{_PKG_REL_NS}Relationship")
+                }
+
+            names = []
+            with package.open("xl/workbook.xml") as part:
+                for _, element in ET.iterparse(part):
+                    if element.tag == f"{_MAIN_NS}sheet":
+                        # Chart sheets aren't in Worksheets
+                        if not rel_types.get(element.get(f"{_DOC_REL_NS}id"), "").endswith("/worksheet"):
+                            return None
+                        names.append(element.get("name"))
+                    elif element.tag == f"{_MAIN_NS}sheets":
+                        break
+            return names or None
+    except (KeyError, zipfile.BadZipFile, ET.ParseError, OSError):
+        return None
+
+
+def read_sheet_names(filepath: str) -> list[str]:
+    """Return the worksheet names saved in the file on disk, ignoring the workbook cache."""
+    names = _read_sheet_names(Path(filepath))
+    if names is None:
+        with open_workbook(filepath) as wb:
+            names = list(get_sheet_index(wb))
+    return names
+
+
 def get_workbook_info(filepath: str, include_ranges: bool = False) -> dict[str, Any]:
-    """Get metadata about workbook including sheets, ranges, etc."""
+    """Get metadata about workbook including sheets, ranges, etc.
+
+    Without include_ranges, sheet names of a workbook that isn't already
+    cached are read from the .xlsx package directly instead of loading it.
+    """
     try:
         path = Path(filepath)
         if not path.exists():
             raise WorkbookError(f"File not found: {filepath}")
 
-        wb = Workbook()
-        wb.LoadFromFile(filepath)
-
-        sheets = [sheet.Name for sheet in wb.Worksheets]
-        info = {
-            "filename": path.name,
-            "sheets": sheets,
-            "size": path.stat().st_size,
-            "modified": path.stat().st_mtime
-        }
+        with workbook_lock(filepath):
+            stat = path.stat()
+            sheet_names = None
+            cached = _WB_CACHE.get(_cache_key(filepath))
+            if not include_ranges and (cached is None or cached[0] != stat.st_mtime):
+                sheet_names = _read_sheet_names(path)
+            if sheet_names is None:
+                wb = get_workbook(filepath)
+                # The memoized name index lists sheets in workbook order
+                sheet_index = get_sheet_index(wb)
+                sheet_names = list(sheet_index)
+
+            info = {
+                "filename": path.name,
+                "sheets": sheet_names,
+                "size": stat.st_size,
+                "modified": stat.st_mtime
+            }
 
-        if include_ranges:
-            # Add used ranges for each sheet
-            ranges = {}
-            for sheet in wb.Worksheets:
-                if sheet.LastRow > 0 and sheet.LastColumn > 0:
-                    last_col = column_to_letter(sheet.LastColumn)
-                    ranges[sheet.Name] = f"A1:{last_col}{sheet.LastRow}"
-            info["used_ranges"] = ranges
+            if include_ranges:
+                # Add used ranges for each sheet
+                ranges = {}
+                for name, sheet in sheet_index.items():
+                    last_row, last_col = sheet.LastRow, sheet.LastColumn
+                    if last_row > 0 and last_col > 0:
+                        ranges[name] = f"A1:{column_to_letter(last_col)}{last_row}"
+                info["used_ranges"] = ranges
 
         return info
 
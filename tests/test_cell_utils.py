@@ -0,0 +1,77 @@
+import pytest
+from spire.xls import *
+
+from spire_xls_mcp.cell_utils import (
+    FIELDS_VALUE,
+    column_to_letter,
+    letter_to_column,
+    parse_ref_fast,
+    serialize_cells_in_range,
+)
+
+
+@pytest.mark.parametrize("column, letter", [
+    (1, "A"), (26, "Z"), (27, "AA"), (52, "AZ"), (53, "BA"),
+    (702, "ZZ"), (703, "AAA"), (16384, "XFD"),
+])
+def test_column_letter_round_trip(column, letter):
+    assert column_to_letter(column) == letter
+    assert letter_to_column(letter) == column
+
+
+def test_letter_to_column_is_case_insensitive():
+    assert letter_to_column("xfd") == 16384
+
+
+def test_letter_to_column_accepts_numbers():
+    assert letter_to_column("12") == 12
+
+
+@pytest.mark.parametrize("bad", ["", "A1", "Ä", "-"])
+def test_letter_to_column_rejects_invalid(bad):
+    with pytest.raises(ValueError):
+        letter_to_column(bad)
+
+
+def test_column_to_letter_passes_letters_through():
+    assert column_to_letter("AB") == "AB"
+
+
+@pytest.mark.parametrize("bad", [0, -1, 1.0, "A1", None])
+def test_column_to_letter_rejects_invalid(bad):
+    with pytest.raises(ValueError):
+        column_to_letter(bad)
+
+
+@pytest.mark.parametrize("ref, expected", [
+    ("A1", (1, 1)),
+    ("b12", (2, 12)),
+    ("XFD1048576", (16384, 1048576)),
+    ("AA10", (27, 10)),
+])
+def test_parse_ref_fast(ref, expected):
+    assert parse_ref_fast(ref) == expected
+
+
+@pytest.mark.parametrize("ref", ["", "A", "1", "A0", "A01", "ABCD1", "A1B", "$A$1", "Ä1", "A 1"])
+def test_parse_ref_fast_rejects_invalid(ref):
+    assert parse_ref_fast(ref) is None
+
+
+def test_serialize_cells_in_range_keys_cells_by_their_own_column():
+    wb = Workbook()
+    sheet = wb.Worksheets[0]
+    sheet.Range["Y3"].Text = "x"
+    sheet.Range["AB5"].NumberValue = 2
+
+    data = serialize_cells_in_range(sheet, 25, 28, 3, 5, FIELDS_VALUE)
+
+    assert list(data) == ["Y", "Z", "AA", "AB"]
+    for letter, cells in data.items():
+        assert list(cells) == [3, 4, 5]
+        for row, cell in cells.items():
+            assert cell["column_letter"] == letter
+            assert cell["address"] == f"{letter}{row}"
+    assert data["Y"][3]["value"] == "x"
+    assert data["AB"][5]["value"] == "2"
+    wb.Dispose()
@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from spire_xls_mcp.exceptions import ValidationError
+from spire_xls_mcp.formatting import format_range
+from spire_xls_mcp.workbook import create_workbook, discard_workbook
+
+
+@pytest.fixture
+def path(tmp_path):
+    filepath = str(tmp_path / "book.xlsx")
+    create_workbook(filepath)
+    yield filepath
+    discard_workbook(filepath)
+
+
+@pytest.mark.parametrize("sheet_name, cell_range", [
+    ("Missing", "A1"),
+    ("Sheet1", "A0"),
+    ("Sheet1", "B2:A1"),
+    ("Sheet1", ""),
+])
+def test_no_op_call_still_validates_sheet_and_range(path, sheet_name, cell_range):
+    with pytest.raises(ValidationError):
+        format_range(path, sheet_name, cell_range)
+
+
+def test_no_op_call_does_not_save(path):
+    mtime = os.path.getmtime(path)
+    assert format_range(path, "Sheet1", "A1:B2") == {"message": "No formatting to apply"}
+    assert os.path.getmtime(path) == mtime
@@ -0,0 +1,40 @@
+from spire_xls_mcp.json_operations import _json_to_rows
+
+
+def test_array_of_objects_with_headers():
+    data = [{"name": "a", "n": 1}, {"n": 2, "name": "b", "extra": True}, "skipped"]
+    assert _json_to_rows(data, True) == ([["name", "n"], ["a", 1], ["b", 2]], 1)
+
+
+def test_array_of_objects_without_headers():
+    data = [{"name": "a", "n": 1}, {"name": "b", "n": 2.5}]
+    assert _json_to_rows(data, False) == ([["a", 1], ["b", 2.5]], 0)
+
+
+def test_missing_keys_and_nested_values_are_stringified():
+    data = [{"a": 1, "b": [1, 2]}, {"a": None}]
+    assert _json_to_rows(data, True) == ([["a", "b"], [1, "[1, 2]"], ["None", "None"]], 1)
+
+
+def test_2d_array():
+    data = [[1, "x", True], [2], "skipped"]
+    assert _json_to_rows(data, True) == ([[1, "x", True], [2]], 0)
+
+
+def test_simple_array():
+    assert _json_to_rows([1, "two", False], True) == ([[1], ["two"], [False]], 0)
+
+
+def test_single_object():
+    data = {"a": 1, "b": "x"}
+    assert _json_to_rows(data, True) == ([["a", "b"], [1, "x"]], 1)
+    assert _json_to_rows(data, False) == ([[1, "x"]], 0)
+
+
+def test_empty_array():
+    assert _json_to_rows([], True) == ([], 0)
+
+
+def test_accepts_an_iterator():
+    items = iter([{"a": 1}, {"a": 2}])
+    assert _json_to_rows(items, True) == ([["a"], [1], [2]], 1)
@@ -0,0 +1,57 @@
+from spire.xls import *
+
+from spire_xls_mcp.cell_utils import EnumMapper
+from spire_xls_mcp.sheet import _compile_filter_criteria
+
+
+class RecordingAutoFilters:
+    """Stands in for sheet.AutoFilters and records the calls made on it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def AddFilter(self, column, value):
+        self.calls.append(("AddFilter", column, value))
+
+    def CustomFilter(self, column, operator, value):
+        self.calls.append(("CustomFilter", column, operator, value))
+
+    def FilterTop10(self, column, top, percent, count):
+        self.calls.append(("FilterTop10", column, top, percent, count))
+
+
+def test_value_filter_adds_each_value_as_text():
+    apply_criteria = _compile_filter_criteria({"type": "value", "values": ["a", 2]})
+    auto_filters = RecordingAutoFilters()
+    apply_criteria(auto_filters, "col")
+    assert auto_filters.calls == [("AddFilter", "col", "a"), ("AddFilter", "col", "2")]
+
+
+def test_custom_filter_resolves_operator_and_value_up_front():
+    apply_criteria = _compile_filter_criteria({"type": "custom", "operator": "greater", "criteria": 5})
+    auto_filters = RecordingAutoFilters()
+    apply_criteria(auto_filters, "col")
+
+    (name, column, operator, value), = auto_filters.calls
+    assert (name, column) == ("CustomFilter", "col")
+    assert operator == EnumMapper.get_filter_operator_enum("greater")
+    assert isinstance(value, Int32)
+
+
+def test_top10_filter_defaults():
+    apply_criteria = _compile_filter_criteria({"type": "top10"})
+    auto_filters = RecordingAutoFilters()
+    apply_criteria(auto_filters, "col")
+    assert auto_filters.calls == [("FilterTop10", "col", True, False, 10)]
+
+
+def test_bottom_percent_filter():
+    apply_criteria = _compile_filter_criteria({"type": "top10", "count": 5, "percent": True, "bottom": True})
+    auto_filters = RecordingAutoFilters()
+    apply_criteria(auto_filters, "col")
+    assert auto_filters.calls == [("FilterTop10", "col", False, True, 5)]
+
+
+def test_unknown_filter_type_is_ignored():
+    assert _compile_filter_criteria({"type": "bogus"}) is None
+    assert _compile_filter_criteria({}) is None
@@ -0,0 +1,73 @@
+import pytest
+
+from spire_xls_mcp import validation
+from spire_xls_mcp.validation import (
+    _parse_plain_range,
+    cached_formula_result,
+    clear_formula_cache,
+    remember_formula_result,
+)
+
+
+@pytest.mark.parametrize("cell_range, expected", [
+    ("A1", (1, 1, 1, 1)),
+    ("B2:D10", (2, 2, 10, 4)),
+    ("$A$1:$C$3", (1, 1, 3, 3)),
+    ("A1:A1", (1, 1, 1, 1)),
+    ("A1:XFD1048576", (1, 1, 1048576, 16384)),
+])
+def test_parse_plain_range(cell_range, expected):
+    assert _parse_plain_range(cell_range) == expected
+
+
+@pytest.mark.parametrize("cell_range", [
+    "D10:B2",           # reversed
+    "A1:XFE1",          # past the last column
+    "A1:A1048577",      # past the last row
+    "A:C",              # whole columns
+    "1:3",              # whole rows
+    "MyRange",          # defined name
+    "A1:",
+    "",
+])
+def test_parse_plain_range_leaves_the_rest_to_spire(cell_range):
+    assert _parse_plain_range(cell_range) is None
+
+
+@pytest.fixture
+def formula_cache():
+    clear_formula_cache()
+    yield
+    clear_formula_cache()
+
+
+def test_formula_cache_round_trip(formula_cache):
+    assert cached_formula_result("=SUM(A1:A3)") is None
+    remember_formula_result("=SUM(A1:A3)", True, "Formula is valid")
+    assert cached_formula_result("=SUM(A1:A3)") == (True, "Formula is valid")
+    clear_formula_cache()
+    assert cached_formula_result("=SUM(A1:A3)") is None
+
+
+def test_formula_cache_evicts_least_recently_used(formula_cache, monkeypatch):
+    monkeypatch.setattr(validation, "_FORMULA_CACHE_SIZE", 2)
+    remember_formula_result("=1", True, "")
+    remember_formula_result("=2", True, "")
+    # A hit makes "=1" the most recently used entry
+    assert cached_formula_result("=1") is not None
+    remember_formula_result("=3", False, "bad")
+
+    assert cached_formula_result("=2") is None
+    assert cached_formula_result("=1") == (True, "")
+    assert cached_formula_result("=3") == (False, "bad")
+
+
+def test_formula_cache_overwrite_refreshes_entry(formula_cache, monkeypatch):
+    monkeypatch.setattr(validation, "_FORMULA_CACHE_SIZE", 2)
+    remember_formula_result("=1", True, "")
+    remember_formula_result("=2", True, "")
+    remember_formula_result("=1", False, "changed")
+    remember_formula_result("=3", True, "")
+
+    assert cached_formula_result("=1") == (False, "changed")
+    assert cached_formula_result("=2") is None
@@ -0,0 +1,168 @@
+import os
+
+import pytest
+
+from spire_xls_mcp import workbook
+from spire_xls_mcp.exceptions import SheetError, WorkbookError
+from spire_xls_mcp.workbook import (
+    _cache_key,
+    abort_batch,
+    batch_edits,
+    begin_batch,
+    commit_batch,
+    create_workbook,
+    discard_workbook,
+    flush_all_workbooks,
+    flush_workbook,
+    get_workbook,
+    mark_dirty,
+    save_workbook,
+    workbook_edit,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    yield
+    for key in list(workbook._WB_CACHE):
+        discard_workbook(key)
+    workbook._OPEN_BATCHES.clear()
+    workbook._BATCH_DEPTH.clear()
+
+
+@pytest.fixture
+def path(tmp_path):
+    filepath = str(tmp_path / "book.xlsx")
+    create_workbook(filepath)
+    return filepath
+
+
+def set_a1(filepath, text):
+    get_workbook(filepath).Worksheets[0].Range["A1"].Text = text
+
+
+def a1_on_disk(filepath):
+    with workbook.open_workbook(filepath) as wb:
+        return wb.Worksheets[0].Range["A1"].Text
+
+
+def test_get_workbook_reuses_cached_copy(path):
+    assert get_workbook(path) is get_workbook(path)
+
+
+def test_get_workbook_missing_file(tmp_path):
+    with pytest.raises(WorkbookError):
+        get_workbook(str(tmp_path / "missing.xlsx"))
+
+
+def test_save_writes_immediately_outside_a_batch(path):
+    set_a1(path, "saved")
+    save_workbook(get_workbook(path), path)
+    assert _cache_key(path) not in workbook._DIRTY
+    assert a1_on_disk(path) == "saved"
+
+
+def test_batch_edits_defers_saves_until_exit(path):
+    with batch_edits(path):
+        set_a1(path, "batched")
+        save_workbook(get_workbook(path), path)
+        assert _cache_key(path) in workbook._DIRTY
+        assert a1_on_disk(path) != "batched"
+    assert _cache_key(path) not in workbook._DIRTY
+    assert a1_on_disk(path) == "batched"
+
+
+def test_nested_batches_save_once_at_the_outermost_exit(path):
+    with batch_edits(path):
+        with batch_edits(path):
+            set_a1(path, "inner")
+            save_workbook(get_workbook(path), path)
+        assert a1_on_disk(path) != "inner"
+    assert a1_on_disk(path) == "inner"
+
+
+def test_batch_does_not_defer_a_workbook_it_does_not_cache(path, tmp_path):
+    other = str(tmp_path / "other.xlsx")
+    wb = workbook.load_workbook(path)
+    with batch_edits(other):
+        save_workbook(wb, other)
+        assert os.path.exists(other)
+    wb.Dispose()
+
+
+def test_commit_batch_saves_changes(path):
+    begin_batch(path)
+    with pytest.raises(WorkbookError):
+        begin_batch(path)
+    set_a1(path, "committed")
+    save_workbook(get_workbook(path), path)
+    assert flush_workbook(path)["saved"] is False
+
+    assert commit_batch(path)["saved"] is True
+    assert a1_on_disk(path) == "committed"
+    with pytest.raises(WorkbookError):
+        commit_batch(path)
+
+
+def test_abort_batch_drops_changes(path):
+    begin_batch(path)
+    set_a1(path, "aborted")
+    save_workbook(get_workbook(path), path)
+
+    abort_batch(path)
+    assert _cache_key(path) not in workbook._WB_CACHE
+    assert a1_on_disk(path) != "aborted"
+    assert get_workbook(path).Worksheets[0].Range["A1"].Text != "aborted"
+
+
+def test_flush_without_pending_changes(path):
+    assert flush_workbook(path)["saved"] is False
+
+
+def test_failed_edit_discards_a_clean_workbook(path):
+    wb = get_workbook(path)
+    with pytest.raises(RuntimeError):
+        with workbook_edit(path):
+            wb.Worksheets[0].Range["A1"].Text = "half done"
+            raise RuntimeError("boom")
+    assert _cache_key(path) not in workbook._WB_CACHE
+    assert get_workbook(path) is not wb
+
+
+def test_expected_failure_keeps_the_workbook(path):
+    wb = get_workbook(path)
+    with pytest.raises(SheetError):
+        with workbook_edit(path, SheetError):
+            raise SheetError("missing sheet")
+    assert get_workbook(path) is wb
+
+
+def test_failed_edit_keeps_pending_changes(path):
+    wb = get_workbook(path)
+    with batch_edits(path):
+        set_a1(path, "pending")
+        save_workbook(wb, path)
+        with pytest.raises(RuntimeError):
+            with workbook_edit(path):
+                raise RuntimeError("boom")
+        assert get_workbook(path) is wb
+        assert _cache_key(path) in workbook._DIRTY
+    assert a1_on_disk(path) == "pending"
+
+
+def test_flush_all_workbooks_saves_dirty_entries(path):
+    set_a1(path, "deferred")
+    mark_dirty(path)
+    assert flush_all_workbooks() == [_cache_key(path)]
+    assert a1_on_disk(path) == "deferred"
+
+
+def test_flush_all_workbooks_leaves_open_batches_unless_closing(path):
+    begin_batch(path)
+    set_a1(path, "open batch")
+    save_workbook(get_workbook(path), path)
+
+    assert flush_all_workbooks() == []
+    assert flush_all_workbooks(close_batches=True) == [_cache_key(path)]
+    assert _cache_key(path) not in workbook._OPEN_BATCHES
+    assert a1_on_disk(path) == "open batch"